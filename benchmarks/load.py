@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cards import STANDARD_DECK
+
+# Load generator for the game API. Each virtual table plays hands the way a
+# client would: restart the table, join players (their cards come from a
+# stand-in dealer), start, then poll /game_status and bet or fold for
+# whoever's turn it is, and finish with a showdown if nobody won by folds.
+# Tables run concurrently; every request's latency is recorded per endpoint.
+#
+#   python benchmarks/load.py                          # in-process (ASGI), no network
+#   python benchmarks/load.py --url http://127.0.0.1:8000
+#
+# Against a running server, a stand-in dealer is started on --dealer-port
+# unless --dealer-url points at one. Runs are reproducible for a given
+# --seed (apart from timing).
+
+# --- STAND-IN DEALER ---
+
+dealer_app = FastAPI()
+
+@dealer_app.get("/get_cards")
+def get_cards():
+    return {"cards": random.sample(STANDARD_DECK, 2)}
+
+def start_dealer(port: int) -> str:
+    """Serve the stand-in dealer on a background thread; returns its URL"""
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(dealer_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="stand-in-dealer", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+# --- LOAD ---
+
+class Recorder:
+    """Latencies (seconds) and error counts per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, method: str, table: str, path: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, f"/tables/{table}{path}", **kwargs)
+        endpoint = f"{method} {path}"
+        self.latencies[endpoint].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return response.json()
+
+async def play_table(client: httpx.AsyncClient, recorder: Recorder, table: str, args, rng: random.Random):
+    names = [f"p{i}" for i in range(args.players)]
+    for _ in range(args.hands):
+        await recorder.call(client, "POST", table, "/start_game")
+        for name in names:
+            await recorder.call(client, "POST", table, "/join_game",
+                                json={"name": name, "host_url": args.dealer_url})
+        await recorder.call(client, "POST", table, "/start_and_play")
+
+        active = True
+        for _ in range(args.actions):
+            status = None
+            for _ in range(max(args.polls, 1)):
+                status = await recorder.call(client, "GET", table, "/game_status")
+            if not status or not status["is_active"]:
+                active = False
+                break
+            turn = status["current_turn"]
+            if rng.random() < args.fold_probability:
+                result = await recorder.call(client, "POST", table, "/fold", json={"name": turn})
+                if result and "winner" in result:
+                    active = False
+                    break
+            else:
+                await recorder.call(client, "POST", table, "/place_bet", json={"name": turn, "amount": args.bet})
+        if active:
+            await recorder.call(client, "POST", table, "/compare_cards")
+
+def percentile(values: List[float], q: float) -> float:
+    # Nearest-rank percentile of sorted values
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(endpoint, 0),
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "p999_ms": percentile(latencies, 0.999) * 1000,
+        }
+    total = sum(len(latencies) for latencies in recorder.latencies.values())
+    return {"elapsed": elapsed, "requests": total, "rps": total / elapsed, "endpoints": endpoints}
+
+def print_report(summary: dict):
+    print(f"{summary['requests']} requests in {summary['elapsed']:.2f}s ({summary['rps']:,.0f} req/s)")
+    print(f"{'endpoint':<24}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'p999 ms':>10}")
+    for endpoint, stats in summary["endpoints"].items():
+        print(f"{endpoint:<24}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10,.0f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['p999_ms']:>10.2f}")
+
+async def run(args) -> dict:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30,
+                                   limits=httpx.Limits(max_connections=args.tables))
+        if not args.dealer_url:
+            args.dealer_url = start_dealer(args.dealer_port)
+    else:
+        # Game server and dealer both in this process, over ASGI transports
+        import dealer
+        from main import app
+        dealer.set_dealer(dealer.DealerClient(transport=httpx.ASGITransport(app=dealer_app)))
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://joker")
+        args.dealer_url = args.dealer_url or "http://dealer"
+
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            play_table(client, recorder, f"load-{i}", args, random.Random(rng.getrandbits(64)))
+            for i in range(args.tables)
+        ))
+        elapsed = time.perf_counter() - started
+    return summarize(recorder, elapsed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a load test against the game API")
+    parser.add_argument("--url", default=None, help="Server base URL (default: in-process ASGI app)")
+    parser.add_argument("--dealer-url", default=None, help="Dealer host URL players join with")
+    parser.add_argument("--dealer-port", type=int, default=9100, help="Port for the stand-in dealer")
+    parser.add_argument("--tables", type=int, default=50, help="Concurrent tables")
+    parser.add_argument("--hands", type=int, default=20, help="Hands per table")
+    parser.add_argument("--players", type=int, default=4, help="Players per table")
+    parser.add_argument("--actions", type=int, default=8, help="Bet/fold actions per hand, at most")
+    parser.add_argument("--polls", type=int, default=1, help="/game_status polls before each action")
+    parser.add_argument("--fold-probability", type=float, default=0.2)
+    parser.add_argument("--bet", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run(args))
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    main()
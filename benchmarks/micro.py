@@ -0,0 +1,186 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch import evaluate_batch
+from decks import DeckPool, set_pool
+from evaluator import evaluate
+from init import initialize_game
+from models import Game
+
+# Micro-benchmarks for the game core, without HTTP in the way. Each case
+# reports the best of several runs in nanoseconds per operation.
+#
+#   python benchmarks/micro.py --save     # record benchmarks/baseline.json
+#   python benchmarks/micro.py            # compare against it
+#   python benchmarks/micro.py --check    # ... and exit 1 on a regression
+#
+# Baselines are only comparable on the same machine, so record one before
+# changing the code and compare after.
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SEED = 1234
+PLAYERS = 6
+BIG_BALANCE = 10 ** 12  # Enough that bet loops never run out
+
+def new_game(players: int = PLAYERS, balance: int = BIG_BALANCE, started: bool = False) -> Game:
+    game = Game("bench")
+    for i in range(players):
+        game.join(f"p{i}", [], balance)
+    if started:
+        initialize_game(game)
+    return game
+
+def timed(run: Callable[[], None], number: int) -> float:
+    # Like timeit, keep the garbage collector out of the measurement
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter_ns()
+        run()
+        return (time.perf_counter_ns() - started) / number
+    finally:
+        gc.enable()
+
+# Each case takes `number` and returns the time per op of one run; setup
+# happens before the clock starts.
+
+def bench_initialize_game(number: int) -> float:
+    games = [new_game() for _ in range(number)]
+    def run():
+        for game in games:
+            initialize_game(game)
+    return timed(run, number)
+
+def bench_showdown(number: int) -> float:
+    games = [new_game(started=True) for _ in range(number)]
+    for game in games:
+        game.bet(game.current_player(), 100)
+    def run():
+        for game in games:
+            game.showdown()
+    return timed(run, number)
+
+def bench_evaluate_2(number: int) -> float:
+    rng = np.random.default_rng(SEED)
+    hands = [tuple(rng.choice(52, 2, replace=False).tolist()) for _ in range(number)]
+    def run():
+        for hand in hands:
+            evaluate(hand)
+    return timed(run, number)
+
+def bench_evaluate_7(number: int) -> float:
+    rng = np.random.default_rng(SEED)
+    hands = [tuple(rng.choice(52, 7, replace=False).tolist()) for _ in range(number)]
+    def run():
+        for hand in hands:
+            evaluate(hand)
+    return timed(run, number)
+
+def bench_evaluate_batch_7(number: int) -> float:
+    rng = np.random.default_rng(SEED)
+    hands = np.argsort(rng.random((number, 52)), axis=1)[:, :7]
+    return timed(lambda: evaluate_batch(hands), number)
+
+def bench_get_player(number: int) -> float:
+    game = new_game(players=9)
+    names = [f"p{i % 9}" for i in range(number)]
+    def run():
+        for name in names:
+            game.get_player(name)
+    return timed(run, number)
+
+def bench_bet(number: int) -> float:
+    game = new_game(started=True)
+    def run():
+        for _ in range(number):
+            game.bet(game.current_player(), 100)
+    return timed(run, number)
+
+def bench_fold(number: int) -> float:
+    # Folding a player out of a table of three leaves two active, so no
+    # payout happens inside the timed loop
+    games = [new_game(players=3, started=True) for _ in range(number)]
+    def run():
+        for game in games:
+            game.fold(game.current_player())
+    return timed(run, number)
+
+CASES: Dict[str, tuple] = {
+    # name: (function, operations per run)
+    "initialize_game": (bench_initialize_game, 2_000),
+    "showdown": (bench_showdown, 2_000),
+    "evaluate_2": (bench_evaluate_2, 20_000),
+    "evaluate_7": (bench_evaluate_7, 2_000),
+    "evaluate_batch_7": (bench_evaluate_batch_7, 100_000),
+    "get_player": (bench_get_player, 100_000),
+    "bet": (bench_bet, 20_000),
+    "fold": (bench_fold, 5_000),
+}
+
+def run_cases(names: List[str], repeat: int) -> Dict[str, float]:
+    # A seeded pool keeps deals, and so showdown work, identical across
+    # runs. It shuffles inline, so initialize_game includes the shuffle.
+    set_pool(DeckPool(seed=SEED, background=False))
+    results = {}
+    for name in names:
+        function, number = CASES[name]
+        results[name] = min(function(number) for _ in range(repeat))
+    set_pool(None)
+    return results
+
+def report(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Print the comparison table; returns the names of regressed cases"""
+    regressions = []
+    print(f"{'case':<20}{'ns/op':>12}{'baseline':>12}{'change':>10}")
+    for name, ns in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<20}{ns:>12,.0f}{'-':>12}{'-':>10}")
+            continue
+        change = ns / base - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<20}{ns:>12,.0f}{base:>12,.0f}{change:>+10.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the game core")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all): {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best one counts")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline file to compare against or save to")
+    parser.add_argument("--save", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown counted as a regression")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on any regression")
+    args = parser.parse_args(argv)
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    results = run_cases(args.cases or list(CASES), args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    if args.check and regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
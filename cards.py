@@ -0,0 +1,43 @@
+from typing import Any
+
+# Cards are small ints 0-51: card = rank_index * 4 + suit_index, so the rank
+# is card >> 2 and the suit is card & 3. Decks, hands and the evaluator all
+# work on these ints; names are only produced at the API boundary.
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+SUITS = ('hearts', 'diamonds', 'clubs', 'spades')
+
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+# Precomputed per-card strings, indexed by card id
+CARD_RANKS = tuple(RANKS[card >> 2] for card in range(52))
+CARD_SUITS = tuple(SUITS[card & 3] for card in range(52))
+CARD_NAMES = tuple(f"{CARD_RANKS[card]} of {CARD_SUITS[card]}" for card in range(52))
+CARD_BY_NAME = {name: card for card, name in enumerate(CARD_NAMES)}
+
+# Standard 52-card deck, built once at import. Shufflers take copies; the
+# canonical tuple is never mutated.
+STANDARD_DECK = tuple(range(52))
+
+def encode_card(rank: str, suit: str) -> int:
+    return RANK_INDEX[rank] * 4 + SUIT_INDEX[suit]
+
+def card_name(card: int) -> str:
+    return CARD_NAMES[card]
+
+def parse_card(value: Any) -> int:
+    """
+    Convert a card from an external payload into its int id. Accepts an int
+    id, a name such as "10 of hearts", or a dict with "rank" and "suit".
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        if 0 <= value < 52:
+            return value
+    elif isinstance(value, str):
+        if value in CARD_BY_NAME:
+            return CARD_BY_NAME[value]
+    elif isinstance(value, dict):
+        rank, suit = value.get("rank"), value.get("suit")
+        if rank in RANK_INDEX and suit in SUIT_INDEX:
+            return encode_card(rank, suit)
+    raise ValueError(f"Invalid card: {value!r}")
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from cards import parse_card
+from tracing import tracer, SPAN_KIND_CLIENT
+
+class DealerError(Exception):
+    pass
+
+class CircuitOpenError(DealerError):
+    pass
+
+class CircuitBreaker:
+    """
+    Per-host breaker: opens after `failure_threshold` consecutive failures,
+    rejects calls for `reset_timeout` seconds, then lets one trial call
+    through (half-open). Success closes it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.trial_in_flight or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def abandon_trial(self):
+        """Release a trial call that ended without an outcome; a no-op otherwise"""
+        self.trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class DealerClient:
+    """
+    Shared async client for dealer /get_cards calls. One pooled
+    httpx.AsyncClient keeps connections alive across requests; each dealer
+    host gets its own concurrency limit and circuit breaker so one slow
+    dealer cannot tie up joins for the others.
+    """
+
+    def __init__(self, timeout: float = 2.0, connect_timeout: float = 1.0,
+                 retries: int = 2, backoff: float = 0.05,
+                 max_connections_per_host: int = 20, max_connections: int = 200,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections_per_host = max_connections_per_host
+        self.max_connections = max_connections
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.transport = transport  # e.g. httpx.ASGITransport for an in-process dealer
+        self._client: Optional[httpx.AsyncClient] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                transport=self.transport,
+            )
+        return self._client
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return limit
+
+    async def get_cards(self, host_url: str) -> List[int]:
+        """Fetch a player's cards from the dealer at host_url as card ids"""
+        host = urlsplit(host_url).netloc or host_url
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Dealer {host} unavailable (circuit open)")
+
+        # If this call is the half-open trial and gets cancelled (client
+        # disconnect, shutdown), neither outcome is recorded; release the
+        # trial so the breaker does not stay open for good.
+        trial = breaker.trial_in_flight
+        try:
+            last_error: Optional[Exception] = None
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+                try:
+                    with tracer.span("dealer.get_cards", SPAN_KIND_CLIENT, host=host, attempt=attempt):
+                        async with self._host_limit(host):
+                            response = await self.client.get(f"{host_url}/get_cards")
+                    if response.status_code >= 500:
+                        last_error = DealerError(f"Dealer returned {response.status_code}")
+                        continue
+                    response.raise_for_status()
+                    cards = [parse_card(card) for card in response.json().get("cards", [])]
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    last_error = e
+                    continue
+                except Exception:
+                    # Bad request or malformed payload: retrying will not help
+                    breaker.record_failure()
+                    raise
+                breaker.record_success()
+                return cards
+
+            breaker.record_failure()
+            raise DealerError(f"Dealer {host} failed after {self.retries + 1} attempts: {last_error}")
+        finally:
+            if trial:
+                breaker.abandon_trial()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+def _client_from_env() -> DealerClient:
+    return DealerClient(
+        timeout=float(os.environ.get("JOKER_DEALER_TIMEOUT", "2.0")),
+        retries=int(os.environ.get("JOKER_DEALER_RETRIES", "2")),
+        max_connections_per_host=int(os.environ.get("JOKER_DEALER_HOST_CONNECTIONS", "20")),
+    )
+
+_dealer: Optional[DealerClient] = None
+
+def get_dealer() -> DealerClient:
+    global _dealer
+    if _dealer is None:
+        _dealer = _client_from_env()
+    return _dealer
+
+def set_dealer(client: Optional[DealerClient]):
+    """Swap the process-wide client, e.g. for one backed by a stand-in dealer"""
+    global _dealer
+    _dealer = client
+
+async def close_dealer():
+    global _dealer
+    if _dealer is not None:
+        await _dealer.aclose()
+        _dealer = None
@@ -0,0 +1,93 @@
+import os
+import queue
+import random
+import threading
+from typing import Optional
+
+from cards import STANDARD_DECK
+
+class DeckPool:
+    """
+    Bounded pool of pre-shuffled decks. A daemon thread keeps the pool
+    topped up so dealing only has to take a ready deck; if the pool is
+    ever drained, get() shuffles inline rather than waiting.
+
+    The RNG is pluggable: pass `seed` for a deterministic sequence of decks
+    (tests, replays), `secure=True` for an OS-entropy CSPRNG (production),
+    or any random.Random instance as `rng`. Seeded pools default to no
+    background thread so the sequence does not depend on scheduling.
+    """
+
+    def __init__(self, size: int = 64, rng: Optional[random.Random] = None,
+                 seed: Optional[int] = None, secure: bool = False,
+                 background: Optional[bool] = None):
+        if rng is None:
+            rng = random.SystemRandom() if secure else random.Random(seed)
+        if background is None:
+            background = seed is None
+        self.rng = rng
+        self.background = background
+        self._decks = queue.Queue(maxsize=size)
+        self._rng_lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def _shuffle(self) -> list:
+        deck = list(STANDARD_DECK)
+        with self._rng_lock:
+            self.rng.shuffle(deck)
+        return deck
+
+    def _fill(self):
+        while not self._stopped.is_set():
+            deck = self._shuffle()
+            while not self._stopped.is_set():
+                try:
+                    self._decks.put(deck, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def start(self):
+        if self._thread is None and self.background:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._fill, name="deck-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self) -> list:
+        """Return a freshly shuffled deck owned by the caller"""
+        if self._thread is None:
+            self.start()
+        try:
+            return self._decks.get_nowait()
+        except queue.Empty:
+            return self._shuffle()
+
+def _pool_from_env() -> DeckPool:
+    # JOKER_DECK_SEED selects the deterministic mode; otherwise decks come
+    # from the OS CSPRNG.
+    seed = os.environ.get("JOKER_DECK_SEED")
+    if seed is not None:
+        return DeckPool(seed=int(seed))
+    return DeckPool(size=int(os.environ.get("JOKER_DECK_POOL_SIZE", "64")), secure=True)
+
+_pool: Optional[DeckPool] = None
+
+def get_pool() -> DeckPool:
+    global _pool
+    if _pool is None:
+        _pool = _pool_from_env()
+    return _pool
+
+def set_pool(pool: Optional[DeckPool]):
+    """Swap the process-wide pool, e.g. for a seeded pool in tests"""
+    global _pool
+    if _pool is not None:
+        _pool.stop()
+    _pool = pool
@@ -0,0 +1,95 @@
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from batch import evaluate_batch
+from cards import STANDARD_DECK
+from evaluator import evaluate
+
+# Win probability of a hand against N random opponent hands of the same
+# size. Small cases are enumerated exactly; larger ones use vectorized Monte
+# Carlo sampling. Results are cached per suit-isomorphic hand, so e.g.
+# every offsuit A-K query after the first is a cache hit.
+
+# Largest number of opponent deals we are willing to enumerate exactly
+MAX_ENUMERATION = 200_000
+DEFAULT_SAMPLES = 20_000
+MAX_SAMPLES = 200_000
+# Monte Carlo deals are drawn and scored this many at a time, which bounds
+# the memory of one query regardless of `samples`
+CHUNK_SAMPLES = 50_000
+
+def canonical_hand(cards: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Relabel suits so that hands equal up to a suit permutation share one
+    key: sort by rank (high first), then number suits in order of first
+    appearance.
+    """
+    cards = sorted(cards, key=lambda card: (-(card >> 2), card & 3))
+    suit_map = {}
+    canonical = []
+    for card in cards:
+        suit = suit_map.setdefault(card & 3, len(suit_map))
+        canonical.append((card & ~3) | suit)
+    return tuple(canonical)
+
+def _deal_count(remaining: int, hand_size: int, opponents: int) -> int:
+    count = 1
+    for i in range(opponents):
+        count *= comb(remaining - i * hand_size, hand_size)
+    return count
+
+def _summarize(hero: int, opponents: np.ndarray) -> Tuple[float, float, float]:
+    """Total wins, ties and equity (ties split evenly) over (deals, opponents) strengths"""
+    best = opponents.max(axis=1)
+    wins = hero > best
+    ties = hero == best
+    tied_with = (opponents == hero).sum(axis=1)
+    share = np.where(wins, 1.0, np.where(ties, 1.0 / (1 + tied_with), 0.0))
+    return float(wins.sum()), float(ties.sum()), float(share.sum())
+
+def _exact(hand: Tuple[int, ...], rest: np.ndarray) -> dict:
+    """Heads-up equity by enumerating every opponent hand"""
+    hands = np.array(list(combinations(rest.tolist(), len(hand))), dtype=np.int64)
+    win, tie, equity = _summarize(evaluate(hand), evaluate_batch(hands)[:, None])
+    n = len(hands)
+    return {"win": win / n, "tie": tie / n, "equity": equity / n, "samples": n, "exact": True}
+
+def _monte_carlo(hand: Tuple[int, ...], rest: np.ndarray, opponents: int, samples: int) -> dict:
+    # Seed from the hand so cached and uncached answers agree run to run
+    rng = np.random.default_rng(abs(hash((hand, opponents, samples))) % (1 << 63))
+    needed = opponents * len(hand)
+    hero = evaluate(hand)
+    totals = np.zeros(3)
+    for start in range(0, samples, CHUNK_SAMPLES):
+        rows = min(CHUNK_SAMPLES, samples - start)
+        # A random draw without replacement from the remaining deck per row
+        dealt = rng.permuted(np.broadcast_to(rest, (rows, len(rest))), axis=1)[:, :needed]
+        strengths = evaluate_batch(dealt.reshape(rows * opponents, len(hand))).reshape(rows, opponents)
+        totals += _summarize(hero, strengths)
+    win, tie, equity = totals / samples
+    return {"win": float(win), "tie": float(tie), "equity": float(equity), "samples": samples, "exact": False}
+
+@lru_cache(maxsize=4096)
+def _equity(hand: Tuple[int, ...], opponents: int, samples: int) -> dict:
+    rest = np.array([card for card in STANDARD_DECK if card not in hand], dtype=np.int64)
+    if opponents == 1 and _deal_count(len(rest), len(hand), 1) <= MAX_ENUMERATION:
+        return _exact(hand, rest)
+    return _monte_carlo(hand, rest, opponents, samples)
+
+def equity(cards: Sequence[int], opponents: int = 1, samples: int = DEFAULT_SAMPLES) -> dict:
+    """
+    Return {"win", "tie", "equity", "samples", "exact"} for `cards` against
+    `opponents` random hands of the same size. Equity counts ties as a
+    split pot.
+    """
+    if not 1 <= len(cards) <= 5:
+        raise ValueError("Hand must have 1 to 5 cards")
+    if len(set(cards)) != len(cards):
+        raise ValueError("Hand contains duplicate cards")
+    if opponents < 1 or len(cards) * (opponents + 1) > len(STANDARD_DECK):
+        raise ValueError("Not enough cards for that many opponents")
+    return dict(_equity(canonical_hand(cards), opponents, samples))
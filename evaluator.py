@@ -0,0 +1,137 @@
+from itertools import combinations, combinations_with_replacement
+from typing import Dict, Iterable, List, Sequence
+
+# Hands are lists of card ids from cards.py (rank * 4 + suit). Each rank gets
+# a prime, so the product of a hand's primes identifies its rank multiset
+# regardless of card order.
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+CARD_PRIMES = [PRIMES[card >> 2] for card in range(52)]
+
+# Hand categories, weakest first
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_NAMES = [
+    "High Card", "One Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Four of a Kind", "Straight Flush",
+]
+
+# --- TABLE CONSTRUCTION ---
+
+def _strength(category: int, ranks: Sequence[int]) -> int:
+    # Category in the top bits, then up to five 4-bit rank slots (most
+    # significant first), so plain int comparison orders hands.
+    value = category
+    for i in range(5):
+        value = (value << 4) | (ranks[i] + 1 if i < len(ranks) else 0)
+    return value
+
+def _straight_high(ranks: Sequence[int]) -> int:
+    """Return the high rank of a 5-distinct-rank straight, or -1"""
+    ranks = sorted(ranks, reverse=True)
+    if ranks[0] - ranks[4] == 4:
+        return ranks[0]
+    if ranks == [12, 3, 2, 1, 0]:  # A-2-3-4-5 wheel
+        return 3
+    return -1
+
+def _rank_strength(ranks: Sequence[int]) -> int:
+    """Strength of a non-flush rank multiset of 1 to 5 cards"""
+    counts: Dict[int, int] = {}
+    for rank in ranks:
+        counts[rank] = counts.get(rank, 0) + 1
+    # Order ranks by (count, rank) so paired ranks outrank kickers
+    ordered = sorted(counts, key=lambda r: (counts[r], r), reverse=True)
+    shape = sorted(counts.values(), reverse=True)
+
+    if shape[0] == 4:
+        category = FOUR_OF_A_KIND
+    elif shape[0] == 3 and len(shape) > 1 and shape[1] == 2:
+        category = FULL_HOUSE
+    elif shape[0] == 3:
+        category = THREE_OF_A_KIND
+    elif shape[0] == 2 and len(shape) > 1 and shape[1] == 2:
+        category = TWO_PAIR
+    elif shape[0] == 2:
+        category = ONE_PAIR
+    else:
+        category = HIGH_CARD
+        if len(ranks) == 5:
+            high = _straight_high(ranks)
+            if high >= 0:
+                return _strength(STRAIGHT, [high])
+    return _strength(category, ordered)
+
+def _flush_strength(ranks: Sequence[int]) -> int:
+    high = _straight_high(ranks)
+    if high >= 0:
+        return _strength(STRAIGHT_FLUSH, [high])
+    return _strength(FLUSH, sorted(ranks, reverse=True))
+
+def _prime_product(ranks: Iterable[int]) -> int:
+    product = 1
+    for rank in ranks:
+        product *= PRIMES[rank]
+    return product
+
+def _rank_multisets(size: int) -> List[tuple]:
+    return [
+        ranks for ranks in combinations_with_replacement(range(13), size)
+        if max(ranks.count(r) for r in set(ranks)) <= 4
+    ]
+
+def _build_tables():
+    rank_table: Dict[int, int] = {}
+    flush_table: Dict[int, int] = {}
+    for size in range(1, 6):
+        for ranks in _rank_multisets(size):
+            rank_table[_prime_product(ranks)] = _rank_strength(ranks)
+    for ranks in combinations(range(13), 5):
+        flush_table[_prime_product(ranks)] = _flush_strength(ranks)
+    return rank_table, flush_table
+
+# Prime product -> strength, for any rank multiset of 1-5 cards, and for
+# 5-card hands of a single suit.
+RANK_TABLE, FLUSH_TABLE = _build_tables()
+
+# --- EVALUATION ---
+
+def evaluate5(cards: Sequence[int]) -> int:
+    c0, c1, c2, c3, c4 = cards
+    product = (CARD_PRIMES[c0] * CARD_PRIMES[c1] * CARD_PRIMES[c2]
+               * CARD_PRIMES[c3] * CARD_PRIMES[c4])
+    suit = c0 & 3
+    if (c1 & 3) == suit and (c2 & 3) == suit and (c3 & 3) == suit and (c4 & 3) == suit:
+        return FLUSH_TABLE[product]
+    return RANK_TABLE[product]
+
+def evaluate(cards: Sequence[int]) -> int:
+    """
+    Return a comparable strength for a hand of 1 to 7 encoded cards.
+    Higher is better; equal values are ties. Hands with more than five
+    cards are scored by their best five-card subset.
+    """
+    n = len(cards)
+    if n == 2:
+        return RANK_TABLE[CARD_PRIMES[cards[0]] * CARD_PRIMES[cards[1]]]
+    if n == 5:
+        return evaluate5(cards)
+    if n > 5:
+        return max(evaluate5(hand) for hand in combinations(cards, 5))
+    product = 1
+    for card in cards:
+        product *= CARD_PRIMES[card]
+    return RANK_TABLE[product]
+
+def category(strength: int) -> int:
+    return strength >> 20
+
+def describe(strength: int) -> str:
+    return CATEGORY_NAMES[category(strength)]
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+# Sentinel pushed to a subscriber queue when it must stop: the stream was
+# closed, or the subscriber fell too far behind and should resume by seq.
+_END = None
+
+class EventStream:
+    """
+    Per-table push channel. Every published event gets the next sequence
+    number and is kept in a bounded history so clients can resume after a
+    reconnect by passing the last seq they saw. publish() may be called
+    from any thread; subscribers are asyncio consumers.
+    """
+
+    def __init__(self, history: int = 1024, queue_size: int = 256):
+        self.seq = 0
+        self.history = deque(maxlen=history)
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, type: str, **data) -> dict:
+        with self._lock:
+            self.seq += 1
+            event = {"seq": self.seq, "type": type, **data}
+            self.history.append(event)
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            self._deliver(loop, queue, event)
+        return event
+
+    def since(self, seq: int) -> Optional[List[dict]]:
+        """Events after seq, or None if some of them have left the history"""
+        with self._lock:
+            return self._since(seq)
+
+    def _since(self, seq: int) -> Optional[List[dict]]:
+        if seq >= self.seq:
+            return []
+        if not self.history or self.history[0]["seq"] > seq + 1:
+            return None
+        return [event for event in self.history if event["seq"] > seq]
+
+    def _deliver(self, loop, queue, event):
+        def offer():
+            if event is not _END and not queue.full():
+                queue.put_nowait(event)
+                return
+            # Ending, or a slow consumer: drop its backlog rather than buffer
+            # without bound. It can resume from the last seq it received.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_END)
+            with self._lock:
+                self._subscribers.discard((loop, queue))
+        try:
+            loop.call_soon_threadsafe(offer)
+        except RuntimeError:
+            # Subscriber's loop is closed
+            with self._lock:
+                self._subscribers.discard((loop, queue))
+
+    async def subscribe(self, since: Optional[int] = None) -> AsyncIterator[dict]:
+        """
+        Yield events as they are published. With `since`, first replay the
+        events after that seq; if they are no longer available, yield one
+        "resync" event so the client reloads a full snapshot.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        key = (loop, queue)
+        with self._lock:
+            backlog = [] if since is None else self._since(since)
+            current = self.seq
+            self._subscribers.add(key)
+        try:
+            if backlog is None:
+                yield {"seq": current, "type": "resync"}
+            else:
+                for event in backlog:
+                    yield event
+            while True:
+                event = await queue.get()
+                if event is _END:
+                    return
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers.discard(key)
+
+    def close(self):
+        """End every subscription, e.g. when the table is removed"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for loop, queue in subscribers:
+            self._deliver(loop, queue, _END)
+
+def format_sse(event: Dict) -> str:
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,276 @@
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, Iterator, Optional
+
+from models import Game, Player
+
+# Append-only journal of game actions, in numbered segments:
+#
+#   journal-<n>.log   records: >II header (payload length, crc32) + JSON payload
+#   snapshot.json     compact state of every table, plus the first segment
+#                     that still has to be replayed on top of it
+#
+# Appends only copy bytes into a buffer; a writer thread flushes and fsyncs
+# the buffer every `flush_interval` seconds. Callers that acknowledge an
+# action wait() for the batch holding its record to be fsynced (group
+# commit): durability costs one fsync per batch rather than per action,
+# and each acknowledged action adds up to about one flush interval of
+# latency. A failed write or fsync is permanent: a segment may now end in a
+# torn record, so nothing more is written and every wait() raises
+# JournalError instead of blocking.
+
+_HEADER = struct.Struct(">II")
+_SEGMENT = re.compile(r"journal-(\d+)\.log$")
+SNAPSHOT_FILE = "snapshot.json"
+
+class JournalError(Exception):
+    pass
+
+def _encode(record: dict) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def read_records(path: str) -> Iterator[dict]:
+    """Yield the records of one segment, stopping at a torn or corrupt tail"""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, offset)
+        payload = data[offset + _HEADER.size:offset + _HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        yield json.loads(payload)
+        offset += _HEADER.size + length
+
+def _fsync_dir(directory: str):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class Journal:
+    def __init__(self, directory: str, flush_interval: float = 0.002, segment: Optional[int] = None):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        if segment is None:
+            segments = list_segments(directory)
+            segment = segments[-1] + 1 if segments else 0
+        self.segment = segment
+        self._file = open(self._segment_path(segment), "ab")
+        self._buffer = bytearray()
+        self._appended = 0                     # Records appended so far
+        self._durable = 0                      # Records known to be fsynced
+        self._error: Optional[BaseException] = None  # First write or fsync failure
+        self._lock = threading.Lock()          # Guards _buffer and _appended
+        self._io_lock = threading.Lock()       # Serializes writes, fsyncs and rotation
+        self._durable_cond = threading.Condition()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"journal-{segment}.log")
+
+    def append(self, record: dict) -> int:
+        """Buffer a record; returns its ticket for wait()"""
+        data = _encode(record)
+        with self._lock:
+            self._buffer += data
+            self._appended += 1
+            ticket = self._appended
+        self._wakeup.set()
+        return ticket
+
+    def wait(self, ticket: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the records up to `ticket` (default: everything appended
+        so far) are fsynced. Returns False on timeout; raises JournalError if
+        the journal failed before they were.
+        """
+        if ticket is None:
+            with self._lock:
+                ticket = self._appended
+        with self._durable_cond:
+            done = self._durable_cond.wait_for(lambda: self._durable >= ticket or self._error is not None,
+                                               timeout)
+            if self._durable < ticket and self._error is not None:
+                raise JournalError(f"Journal write failed: {self._error!r}")
+            return done
+
+    def _take_buffer(self):
+        with self._lock:
+            data, self._buffer = self._buffer, bytearray()
+            return data, self._appended
+
+    def _mark_durable(self, count: int):
+        with self._durable_cond:
+            self._durable = max(self._durable, count)
+            self._durable_cond.notify_all()
+
+    def _write(self, data: bytes, count: int):
+        """Write and fsync `data`, holding the first `count` records; call with _io_lock held"""
+        if self._error is not None:
+            raise JournalError(f"Journal write failed: {self._error!r}")
+        try:
+            if data:
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+        except Exception as e:
+            with self._durable_cond:
+                self._error = e
+                self._durable_cond.notify_all()
+            raise
+        self._mark_durable(count)
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            # Let concurrent appends pile up into one batch
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Journal writer stopped: {e!r}")
+                return
+
+    def flush(self):
+        """Write and fsync everything appended so far"""
+        with self._io_lock:
+            self._write(*self._take_buffer())
+
+    def rotate(self) -> int:
+        """Flush and start a new segment; returns the new segment number"""
+        with self._io_lock:
+            self._write(*self._take_buffer())
+            self._file.close()
+            self.segment += 1
+            self._file = open(self._segment_path(self.segment), "ab")
+            return self.segment
+
+    def write_snapshot(self, state: Dict[str, dict], replay_from: int):
+        """Atomically store a snapshot and drop the segments it covers"""
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"segment": replay_from, "tables": state}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.directory)
+        for segment in list_segments(self.directory):
+            if segment < replay_from:
+                os.remove(self._segment_path(segment))
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join()
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+def list_segments(directory: str):
+    segments = []
+    for name in os.listdir(directory):
+        match = _SEGMENT.match(name)
+        if match:
+            segments.append(int(match.group(1)))
+    return sorted(segments)
+
+# --- SNAPSHOT / REPLAY ---
+
+def snapshot_game(game: Game) -> dict:
+    """
+    Compact state of one table; call with game.lock held (lists are
+    copied). The ledger's transfer log is left out so a snapshot stays
+    bounded by the number of players; a restored ledger logs only the
+    transfers after it.
+    """
+    return {
+        "seq": game.events.seq,
+        "is_active": game.is_active,
+        "order": list(game.current_turn_order),
+        "turn": game.current_turn_index,
+        "deck": list(game.deck),
+        "balances": game.ledger.balances.tolist(),
+        "players": [
+            [p.name, p.account, list(p.cards), p.current_bet, p.is_active] for p in game.players
+        ],
+    }
+
+def restore_game(table_id: str, state: dict) -> Game:
+    game = Game(table_id)
+    ledger = game.ledger
+    ledger.balances = array("q", state["balances"])
+    for name, account, cards, current_bet, is_active in state["players"]:
+        player = Player(name=name, ledger=ledger, account=account, cards=cards)
+        player.current_bet = current_bet
+        player.is_active = is_active
+        game.add_player(player)
+    game.is_active = state["is_active"]
+    game.current_turn_order = state["order"]
+    game.current_turn_index = state["turn"]
+    game.deck = state["deck"]
+    game.events.seq = state["seq"]
+    return game
+
+def apply_record(tables: Dict[str, Game], record: dict):
+    """Re-run one journaled action through the Game rules"""
+    table_id, op = record["t"], record["op"]
+    if op == "create":
+        tables[table_id] = Game(table_id)
+        return
+    if op == "close":
+        tables.pop(table_id, None)
+        return
+    game = tables[table_id]
+    if op == "reset":
+        game.restart()
+    elif op == "join":
+        game.join(record["name"], record["cards"], record["balance"])
+    elif op == "start":
+        game.start(record["deck"])
+    elif op == "bet":
+        game.bet(game.get_player(record["name"]), record["amount"])
+    elif op == "fold":
+        game.fold(game.get_player(record["name"]))
+    elif op == "show":
+        game.showdown()
+    else:
+        raise ValueError(f"Unknown journal op: {op!r}")
+
+def recover(directory: str) -> Dict[str, Game]:
+    """Rebuild all tables from the latest snapshot plus the segments after it"""
+    tables: Dict[str, Game] = {}
+    replay_from = 0
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            snapshot = json.load(f)
+        replay_from = snapshot["segment"]
+        for table_id, state in snapshot["tables"].items():
+            tables[table_id] = restore_game(table_id, state)
+    if os.path.isdir(directory):
+        for segment in list_segments(directory):
+            if segment >= replay_from:
+                for record in read_records(os.path.join(directory, f"journal-{segment}.log")):
+                    try:
+                        apply_record(tables, record)
+                    except Exception as e:
+                        # One bad record must not make the server unable to start
+                        print(f"Skipping journal record {record!r} in segment {segment}: {e!r}")
+    return tables
@@ -0,0 +1,72 @@
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Sequence
+
+# Money is held as integer minor units (cents). Floats only appear at the API
+# boundary, converted with to_cents / from_cents.
+
+POT = 0         # Account 0 of every table ledger is the pot
+EXTERNAL = -1   # Source of opening balances, never an actual account
+
+class InsufficientFunds(Exception):
+    pass
+
+def to_cents(amount) -> int:
+    return int(Decimal(str(amount)).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def from_cents(cents: int) -> float:
+    return cents / 100
+
+class Ledger:
+    """
+    Per-table ledger. Balances live in one array indexed by account id, so
+    balance queries are O(1). Every movement of money is appended to the
+    transfer log (three parallel arrays: source, destination, amount).
+    """
+
+    def __init__(self):
+        self.balances = array("q", [0])  # POT starts empty
+        self.sources = array("q")
+        self.destinations = array("q")
+        self.amounts = array("q")
+
+    def _log(self, source: int, destination: int, amount: int):
+        self.sources.append(source)
+        self.destinations.append(destination)
+        self.amounts.append(amount)
+
+    def open_account(self, balance: int = 0) -> int:
+        account = len(self.balances)
+        self.balances.append(balance)
+        if balance:
+            self._log(EXTERNAL, account, balance)
+        return account
+
+    def balance(self, account: int) -> int:
+        return self.balances[account]
+
+    def transfer(self, source: int, destination: int, amount: int):
+        if amount < 0:
+            raise ValueError("Transfer amount must not be negative")
+        if amount > self.balances[source]:
+            raise InsufficientFunds("Insufficient balance.")
+        self.balances[source] -= amount
+        self.balances[destination] += amount
+        self._log(source, destination, amount)
+
+    def settle(self, source: int, winners: Sequence[int]) -> List[int]:
+        """
+        Pay out the whole balance of `source` (normally the pot) to the
+        winners in equal shares. Odd cents go to the earliest winners, so
+        the split is exact. Returns each winner's share.
+        """
+        total = self.balances[source]
+        share, remainder = divmod(total, len(winners))
+        payouts = [share + (1 if i < remainder else 0) for i in range(len(winners))]
+        for account, amount in zip(winners, payouts):
+            if amount:
+                self.transfer(source, account, amount)
+        return payouts
+
+    def transfer_count(self) -> int:
+        return len(self.amounts)
@@ -1,5 +1,22 @@
-from fastapi import FastAPI, BackgroundTasks
-from playapi import router as playapi_router
+from fastapi import FastAPI, HTTPException, Depends, Header, Query
+from fastapi.responses import RedirectResponse, PlainTextResponse
+from playapi import router as playapi_router, join_game, DEFAULT_TABLE
+import playapi
+from models import JoinGameRequest
+from dealer import close_dealer
+from metrics import metrics, Rate
+from profiling import profile_lock, sample_stacks, collapsed, top_allocations
+from tracing import tracer, to_otlp, SPAN_KIND_SERVER
+from typing import Optional
+from urllib.parse import parse_qs
+from starlette.websockets import WebSocket
+import argparse
+import asyncio
+import os
+import secrets
+import subprocess
+import sys
+import time
 import requests
 
 app = FastAPI()
@@ -7,25 +24,306 @@ app = FastAPI()
 # Include the router from playapi.py
 app.include_router(playapi_router)
 
-# Function to automatically join players
-def auto_join_players():
-    players_to_join = [
-        {"name": "JK", "host_url": "http://192.168.43.238:8000"},
-        {"name": "Alice", "host_url": "http://192.168.43.238:8000"}
+# --- TABLE SHARDING ---
+
+# With several workers (see `python main.py serve`), each table lives in
+# exactly one process, chosen by consistent hashing on its id. Requests for
+# a table owned elsewhere are redirected there with 307 so the method and
+# body are preserved. WebSocket clients are told where to reconnect instead
+# (close code 4307, the owner's URL as the reason), since WebSocket clients
+# do not follow redirects.
+placement = playapi.placement
+
+WS_WRONG_WORKER = 4307
+
+_route_paths = {route.path for route in playapi_router.routes}
+# Un-prefixed routes that act on a table (via ?table_id=, default table otherwise)
+LEGACY_TABLE_PATHS = {path for path in _route_paths if f"/tables/{{table_id}}{path}" in _route_paths}
+
+def request_table_id(scope):
+    """Return the table an HTTP or WebSocket request targets, or None for process-level routes"""
+    path = scope["path"]
+    if path.startswith("/tables/"):
+        return path.split("/")[2]
+    if path in LEGACY_TABLE_PATHS:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return query.get("table_id", [DEFAULT_TABLE])[-1]
+    return None
+
+class OwnerRoutingMiddleware:
+    """Sends requests for tables owned by another worker to that worker (plain ASGI)"""
+
+    def __init__(self, app, placement):
+        self.app = app
+        self.placement = placement
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            table_id = request_table_id(scope)
+            if table_id is not None and not self.placement.is_local(table_id):
+                url = self.placement.owner(table_id) + scope["path"]
+                if scope.get("query_string"):
+                    url += "?" + scope["query_string"].decode("latin-1")
+                if scope["type"] == "http":
+                    await RedirectResponse(url, status_code=307)(scope, receive, send)
+                else:
+                    websocket = WebSocket(scope, receive, send)
+                    await websocket.accept()
+                    # http(s):// -> ws(s)://
+                    await websocket.close(code=WS_WRONG_WORKER, reason="ws" + url.removeprefix("http"))
+                return
+        await self.app(scope, receive, send)
+
+# --- METRICS / TRACING ---
+
+_hands_rate = Rate()
+
+def route_label(scope) -> str:
+    # The matched route template (set on the scope by the router), with
+    # /tables/{table_id} folded into the legacy path so both forms of a
+    # route share one series
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return route.path.removeprefix("/tables/{table_id}") or route.path
+
+class MetricsMiddleware:
+    """
+    Records request counts and latency per route. Plain ASGI rather than
+    @app.middleware("http"), which would add a task and response
+    re-streaming to every request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500  # If the app fails before starting a response
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_label(scope)
+            metrics.observe("joker_http_request_duration_seconds", time.perf_counter() - started,
+                            (("route", route),))
+            metrics.inc("joker_http_requests_total",
+                        (("method", scope["method"]), ("route", route), ("status", str(status))))
+
+app.add_middleware(MetricsMiddleware)
+
+class TracingMiddleware:
+    """Opens the root span of each HTTP request; handler and dealer spans nest under it"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.span(scope["method"], SPAN_KIND_SERVER) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.attributes["http.status_code"] = message["status"]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                span.name = f"{scope['method']} {route_label(scope)}"
+                span.attributes["table_id"] = request_table_id(scope) or ""
+
+# Tracing is opt-in via JOKER_TRACE_FILE; spans are written there as
+# OTLP/JSON on shutdown (and are available from /admin/traces). Without
+# it, neither the middleware nor any span bookkeeping runs.
+if os.environ.get("JOKER_TRACE_FILE"):
+    tracer.enabled = True
+    app.add_middleware(TracingMiddleware)
+
+# Outermost, so requests for other workers' tables are redirected first.
+# Single-process deployments skip it entirely.
+if placement is not None:
+    app.add_middleware(OwnerRoutingMiddleware, placement=placement)
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of this process's metrics"""
+    games = list(playapi.tables.values())
+    gauges = [
+        ("joker_tables", (), len(games)),
+        ("joker_active_players", (), sum(game.active_count for game in games if game.is_active)),
+        ("joker_hands_per_second", (), _hands_rate.update(metrics.counter_total("joker_hands_total"))),
     ]
-    for player in players_to_join:
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
+
+# --- ADMIN ---
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    # Admin routes exist only when JOKER_ADMIN_TOKEN is set, and need
+    # "Authorization: Bearer <token>"
+    token = os.environ.get("JOKER_ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not authorization or not secrets.compare_digest(authorization.removeprefix("Bearer "), token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+def profile(seconds: float = Query(10, gt=0, le=300), interval: float = Query(0.005, ge=0.001, le=1)):
+    """Sample all threads for N seconds; returns collapsed stacks for a flamegraph"""
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        stacks = sample_stacks(seconds, interval)
+    finally:
+        profile_lock.release()
+    return PlainTextResponse(collapsed(stacks))
+
+@app.get("/admin/allocations", dependencies=[Depends(require_admin)])
+def allocations(seconds: float = Query(10, gt=0, le=300), limit: int = Query(25, ge=1, le=1000),
+                frames: int = Query(1, ge=1, le=50)):
+    """Top allocations by source line, traced with tracemalloc for N seconds"""
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        return top_allocations(seconds, limit, frames)
+    finally:
+        profile_lock.release()
+
+@app.get("/admin/traces", dependencies=[Depends(require_admin)])
+def traces():
+    """Buffered tracing spans as OTLP/JSON"""
+    return to_otlp(list(tracer.spans))
+
+# --- PLAYER SEEDING ---
+
+def parse_roster(spec: str):
+    """
+    Parse a roster such as "JK=http://127.0.0.1:9000,Alice=http://127.0.0.1:9000"
+    into join requests (name=dealer host URL, comma separated).
+    """
+    roster = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, host_url = entry.partition("=")
+        if not name or not host_url:
+            raise ValueError(f"Invalid roster entry: {entry!r}")
+        roster.append({"name": name.strip(), "host_url": host_url.strip()})
+    return roster
+
+async def seed_players(roster, table_id: str = DEFAULT_TABLE):
+    """Join each player in the roster directly, without an HTTP round trip"""
+    for player in roster:
         try:
-            response = requests.post(
-                "http://192.168.43.238:8000/join_game",
-                json=player
-            )
+            response = await join_game(JoinGameRequest(**player), table_id)
+            print(f"Joined player: {player['name']}, Response: {response.body.decode()}")
+        except HTTPException as e:
+            print(f"Failed to join player {player['name']}: {e.detail}")
+
+# --- STARTUP / SHUTDOWN ---
+
+async def snapshot_loop(interval: float):
+    # Periodic snapshots bound how much journal a restart has to replay
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(playapi.snapshot_tables)
+
+@app.on_event("startup")
+async def startup_event():
+    # Journaling is opt-in via JOKER_JOURNAL_DIR; tables are recovered from
+    # it before the first request is served.
+    journal_dir = os.environ.get("JOKER_JOURNAL_DIR")
+    if journal_dir:
+        flush_interval = float(os.environ.get("JOKER_JOURNAL_FLUSH_INTERVAL", "0.002"))
+        await asyncio.to_thread(playapi.enable_journal, journal_dir, flush_interval)
+        interval = float(os.environ.get("JOKER_SNAPSHOT_INTERVAL", "60"))
+        app.state.snapshot_task = asyncio.create_task(snapshot_loop(interval))
+
+    # Turn deadlines are opt-in via JOKER_TURN_TIMEOUT (seconds per turn)
+    turn_timeout = float(os.environ.get("JOKER_TURN_TIMEOUT", "0"))
+    if turn_timeout > 0:
+        playapi.enable_turn_timer(turn_timeout)
+
+    # Seeding is opt-in via JOKER_SEED_PLAYERS and runs as a background task
+    # so it never delays the server from accepting requests.
+    roster = parse_roster(os.environ.get("JOKER_SEED_PLAYERS", ""))
+    if roster and playapi.owns_table(DEFAULT_TABLE):
+        app.state.seed_task = asyncio.create_task(seed_players(roster))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    snapshot_task = getattr(app.state, "snapshot_task", None)
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    playapi.disable_turn_timer()
+    trace_file = os.environ.get("JOKER_TRACE_FILE")
+    if trace_file:
+        await asyncio.to_thread(tracer.export, trace_file)
+    await asyncio.to_thread(playapi.disable_journal)
+    # Release pooled dealer connections
+    await close_dealer()
+
+# --- CLI ---
+
+def seed_command(args):
+    """Join the roster on an already running server over HTTP"""
+    prefix = f"/tables/{args.table}" if args.table else ""
+    for player in parse_roster(args.players):
+        try:
+            response = requests.post(f"{args.url}{prefix}/join_game", json=player, timeout=10)
             print(f"Joined player: {player['name']}, Response: {response.json()}")
         except Exception as e:
             print(f"Failed to join player {player['name']}: {str(e)}")
 
-# Root endpoint to trigger background tasks
-@app.on_event("startup")
-async def startup_event():
-    # Schedule the auto_join_players function to run in the background
-    import threading
-    threading.Thread(target=auto_join_players).start()
\ No newline at end of file
+def serve_command(args):
+    """Run one single-threaded uvicorn process per worker, each owning a shard of tables"""
+    urls = [f"http://{args.host}:{args.port + i}" for i in range(args.workers)]
+    processes = []
+    for i in range(args.workers):
+        env = dict(os.environ, JOKER_WORKERS=",".join(urls), JOKER_WORKER_ID=str(i))
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", args.host, "--port", str(args.port + i)],
+            env=env,
+        ))
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Joker game server utilities")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Join a roster of players on a running server")
+    seed.add_argument("players", help='Roster, e.g. "JK=http://127.0.0.1:9000,Alice=http://127.0.0.1:9000"')
+    seed.add_argument("--url", default="http://127.0.0.1:8000", help="Game server base URL")
+    seed.add_argument("--table", default=None, help="Table id (defaults to the default table)")
+    seed.set_defaults(func=seed_command)
+
+    serve = commands.add_parser("serve", help="Run N worker processes with tables sharded across them")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000, help="Port of worker 0; worker i listens on port + i")
+    serve.set_defaults(func=serve_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
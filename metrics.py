@@ -0,0 +1,145 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# Process metrics in the Prometheus text format. Every thread updates its
+# own shard of plain dicts, so recording is a dict update with no lock; a
+# scrape merges the shards. Shards of threads that have exited are kept, so
+# counters never go backwards.
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        # Per-bucket counts (the last one is +Inf) followed by the sum
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+class Metrics:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.help: Dict[str, Tuple[str, str]] = {}  # name -> (type, help text)
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()  # Only taken when a thread records for the first time
+
+    def describe(self, name: str, type: str, help: str):
+        self.help[name] = (type, help)
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1):
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Labels = ()):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def collect(self):
+        """Merge all shards into (counters, histograms)"""
+        with self._shards_lock:
+            shards = list(self._shards)
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        for shard in shards:
+            # Copy first: the owning thread may add keys while we iterate
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, counts in list(shard.histograms.items()):
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = list(counts)
+                else:
+                    for i, count in enumerate(counts):
+                        merged[i] += count
+        return counters, histograms
+
+    def counter_total(self, name: str) -> float:
+        counters, _ = self.collect()
+        return sum(value for (key, _), value in counters.items() if key == name)
+
+    def render(self, gauges: Iterable[Tuple[str, Labels, float]] = ()) -> str:
+        """Text exposition of all counters and histograms, plus `gauges` computed by the caller"""
+        counters, histograms = self.collect()
+        lines: List[str] = []
+        described = set()
+
+        def header(name: str, default_type: str):
+            if name not in described:
+                described.add(name)
+                type, help = self.help.get(name, (default_type, ""))
+                if help:
+                    lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {type}")
+
+        for name, labels, value in gauges:
+            header(name, "gauge")
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), counts in sorted(histograms.items()):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(counts[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Rate:
+    """Per-second rate of a counter between consecutive scrapes"""
+
+    def __init__(self):
+        self._last = None  # (monotonic time, total)
+
+    def update(self, total: float) -> float:
+        now = time.monotonic()
+        last, self._last = self._last, (now, total)
+        if last is None or now <= last[0]:
+            return 0.0
+        return (total - last[1]) / (now - last[0])
+
+# Process-wide registry used by the API
+metrics = Metrics()
+metrics.describe("joker_http_requests_total", "counter", "HTTP requests by route, method and status")
+metrics.describe("joker_http_request_duration_seconds", "histogram", "HTTP request latency by route")
+metrics.describe("joker_hands_total", "counter", "Hands finished, by fold or showdown")
+metrics.describe("joker_showdowns_total", "counter", "Hands decided by comparing cards")
+metrics.describe("joker_dealer_request_duration_seconds", "histogram", "Dealer /get_cards latency in join_game")
+metrics.describe("joker_tables", "gauge", "Tables hosted by this process")
+metrics.describe("joker_active_players", "gauge", "Players still in a running hand")
+metrics.describe("joker_hands_per_second", "gauge", "Hands finished per second since the previous scrape")
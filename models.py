@@ -1,25 +1,42 @@
 from pydantic import BaseModel
+import threading
+import uuid
 from typing import List, Optional
+from events import EventStream
+from evaluator import evaluate, describe
+from ledger import Ledger, POT, from_cents
 
-# Card Model
+# Card Model (API representation; the game itself holds int ids from cards.py)
 class Card(BaseModel):
     rank: str
     suit: str
     name: str
 
-# Player Model
+# Starting stack for a new player, in cents
+DEFAULT_BALANCE = 10_000
+
+# Player Model. Money is in integer cents; the balance lives in the table
+# ledger under the player's account.
 class Player:
-    def __init__(self, name: str, balance: float = 100.0):
+    def __init__(self, name: str, ledger: Ledger, account: int, cards: Optional[list] = None):
         self.name = name
-        self.balance = balance
-        self.cards = []
-        self.current_bet = 0.0
+        self.ledger = ledger
+        self.account = account
+        self.cards = cards if cards is not None else []  # Card ids
+        self.current_bet = 0
         self.is_active = True
+        self.seat = None  # Index into Game.players, assigned on join
+
+    @property
+    def balance(self) -> int:
+        return self.ledger.balances[self.account]
 
-    def place_bet(self, amount: float):
+    def place_bet(self, amount: int):
+        if amount < 0:
+            return False, "Invalid bet amount."
         if amount > self.balance:
             return False, "Insufficient balance."
-        self.balance -= amount
+        self.ledger.transfer(self.account, POT, amount)
         self.current_bet += amount
         return True, None
 
@@ -28,14 +45,178 @@ class Player:
 
 # Game Model
 class Game:
-    def __init__(self):
-        self.players = []
+    def __init__(self, table_id: str = "default"):
+        self.table_id = table_id
+        # These survive reset: subscribers stay attached and in-flight
+        # requests keep serializing on the same lock.
+        self.events = EventStream()
+        self.lock = threading.RLock()  # Guards all game state mutations
+        self.journal = None  # Optional journal.Journal recording every state change
+        self.timer = None  # Optional timers.TurnTimer that folds players who run out of time
+        self.turn_token = 0  # Bumped on every new turn; tells stale timer deadlines apart
+        # Distinguishes this Game from an earlier table with the same id, so
+        # (epoch, version) identifies a state uniquely
+        self.epoch = uuid.uuid4().hex[:12]
+        self.status_cache = None  # (version, etag, serialized /game_status body)
+        self.reset()
+
+    @property
+    def version(self) -> int:
+        # Every state change publishes at least one event, so the event
+        # sequence number doubles as a monotonically increasing state version
+        return self.events.seq
+
+    def reset(self):
+        self.players = []        # Seat-indexed: players[seat]
+        self.seats = {}          # Player name -> seat
+        self.active_count = 0
         self.is_active = False
-        self.current_turn_order = []
+        self.current_turn_order = []  # Seats, in turn order
         self.current_turn_index = 0
-        self.pot = 0.0
+        self.ledger = Ledger()
         self.deck = []
 
+    @property
+    def pot(self) -> int:
+        return self.ledger.balances[POT]
+
+    def add_player(self, player: Player):
+        player.seat = len(self.players)
+        self.seats[player.name] = player.seat
+        self.players.append(player)
+        if player.is_active:
+            self.active_count += 1
+
+    def get_player(self, name: str) -> Optional[Player]:
+        seat = self.seats.get(name)
+        return None if seat is None else self.players[seat]
+
+    def current_player(self) -> Player:
+        return self.players[self.current_turn_order[self.current_turn_index]]
+
+    def is_turn(self, player: Player) -> bool:
+        return self.current_turn_order[self.current_turn_index] == player.seat
+
+    def advance_turn(self):
+        """Move to the next player in turn order who has not folded"""
+        order = self.current_turn_order
+        for _ in range(len(order)):
+            self.current_turn_index = (self.current_turn_index + 1) % len(order)
+            if self.players[order[self.current_turn_index]].is_active:
+                return
+
+    def active_players(self) -> List[Player]:
+        return [p for p in self.players if p.is_active]
+
+    # --- Rules ---
+    # Every state change goes through these methods. They publish events
+    # and append to the journal, so replaying the journal through them
+    # rebuilds identical state. Callers validate and hold self.lock. An
+    # action is journaled only once it has been applied, so a call that
+    # raises never leaves a record that would fail again on replay.
+
+    def record(self, op: str, **data):
+        if self.journal is not None:
+            self.journal.append({"t": self.table_id, "op": op, **data})
+
+    def publish_turn(self):
+        self.turn_token += 1
+        if self.timer is not None:
+            self.timer.schedule(self, self.turn_token)
+        self.events.publish("turn", player=self.current_player().name)
+
+    def restart(self):
+        """Clear players and state for a new session"""
+        self.reset()
+        self.events.publish("reset")
+        self.record("reset")
+
+    def join(self, name: str, cards: list, balance: int = DEFAULT_BALANCE) -> Player:
+        player = Player(name=name, ledger=self.ledger, account=self.ledger.open_account(balance), cards=cards)
+        self.add_player(player)
+        self.events.publish("join", player=name, balance=from_cents(balance))
+        self.record("join", name=name, cards=cards, balance=balance)
+        return player
+
+    def start(self, deck: list):
+        """Deal two cards to each player from `deck` (top is the end) and begin"""
+        if not self.players:
+            raise ValueError("No players to deal to")
+        if 2 * len(self.players) > len(deck):
+            raise ValueError("Not enough cards to deal to every player")
+        self.deck = list(deck)
+        
+        # Deal two cards to each player; players who folded last hand are back in
+        for player in self.players:
+            player.cards = [self.deck.pop(), self.deck.pop()]
+            player.current_bet = 0
+            player.is_active = True
+        self.active_count = len(self.players)
+        
+        # Set the initial turn order (order of joining, i.e. seat order).
+        # Everyone is active, so the first seat starts.
+        self.current_turn_order = [player.seat for player in self.players]
+        self.current_turn_index = 0
+        self.is_active = True
+        self.events.publish("start")
+        self.publish_turn()
+        self.record("start", deck=deck)
+
+    def bet(self, player: Player, amount: int) -> Optional[str]:
+        """Place a bet for the current player; returns an error message on failure"""
+        if not self.is_active:
+            return "Game not active"
+        success, msg = player.place_bet(amount)
+        if not success:
+            return msg
+        self.advance_turn()
+        self.events.publish("bet", player=player.name, amount=from_cents(amount), pot=from_cents(self.pot),
+                            balance=from_cents(player.balance), current_bet=from_cents(player.current_bet))
+        self.publish_turn()
+        self.record("bet", name=player.name, amount=amount)
+        return None
+
+    def fold(self, player: Player) -> Optional[Player]:
+        """Fold a player; returns the winner if only one active player remains"""
+        if not self.is_active:
+            raise ValueError("Game not active")
+        if not player.is_active:
+            return None
+        player.fold()
+        self.active_count -= 1
+        self.events.publish("fold", player=player.name)
+        winner = None
+        if self.active_count == 1:
+            winner = self.active_players()[0]
+            self.award_pot([winner])
+        else:
+            self.advance_turn()
+            self.publish_turn()
+        self.record("fold", name=player.name)
+        return winner
+
+    def showdown(self):
+        """
+        Split the pot between the strongest active hands (equal strengths
+        tie); returns (winners in seat order, strength)
+        """
+        hands = [(evaluate(p.cards), p) for p in self.active_players()]
+        strength = max(value for value, _ in hands)
+        winners = [p for value, p in hands if value == strength]
+        self.award_pot(winners, hand=describe(strength))
+        self.record("show")
+        return winners, strength
+
+    def award_pot(self, winners: List[Player], **extra):
+        """Split the pot between the winners (odd cents to the earliest seats) and end the game"""
+        self.ledger.settle(POT, [winner.account for winner in winners])
+        self.is_active = False
+        # winner/balance name the first winner, as before splits existed;
+        # balances carries every winner's new balance
+        self.events.publish("winner", winner=winners[0].name, balance=from_cents(winners[0].balance),
+                            winners=[winner.name for winner in winners],
+                            balances={winner.name: from_cents(winner.balance) for winner in winners}, **extra)
+
 # API Models
 class JoinGameRequest(BaseModel):
     name: str
@@ -1,166 +1,548 @@
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from typing import Dict, Optional
 from models import Game, Player, JoinGameRequest, BetRequest, FoldRequest, GameStatusResponse, EndGameResponse
 from init import initialize_game
+from evaluator import describe
+from cards import card_name, STANDARD_DECK
+from dealer import get_dealer, CircuitOpenError
+from events import format_sse
+from journal import Journal, JournalError, recover, snapshot_game
+from ledger import to_cents, from_cents
+from equity import equity, DEFAULT_SAMPLES, MAX_SAMPLES
+from timers import TurnTimer
+from metrics import metrics
+from tracing import tracer
+from sharding import placement_from_env
+from contextlib import contextmanager
+from responses import (JSONResponse, dumps, GameStatus, PlayerStatus, BetResult, FoldResult,
+                       WinResult, ShowdownResult, PlayerCards, TableList, JoinResult, GameStarted,
+                       PotStatus, EquityResult)
+import asyncio
 import random
-import requests
+import threading
+import time
 
-# Create a router instead of a FastAPI instance
-router = APIRouter()
+# Create a router instead of a FastAPI instance. Hot routes return a
+# JSONResponse built from the structs in responses.py directly.
+router = APIRouter(default_response_class=JSONResponse)
 
-# Global game instance
-game = Game()
+# With several workers (JOKER_WORKERS, see sharding.py) each table lives in
+# exactly one of them; None in a single-process deployment
+placement = placement_from_env()
+
+def owns_table(table_id: str) -> bool:
+    return placement is None or placement.is_local(table_id)
+
+# Table registry keyed by table id. The un-prefixed routes operate on the
+# default table so existing single-table clients keep working; only the
+# worker that owns it hosts it.
+DEFAULT_TABLE = "default"
+tables: Dict[str, Game] = {DEFAULT_TABLE: Game(DEFAULT_TABLE)} if owns_table(DEFAULT_TABLE) else {}
+
+# Each table serializes its own mutations on game.lock, so tables never
+# contend with each other. This lock only guards adding/removing tables.
+registry_lock = threading.Lock()
+
+# Durable log of every table action, if enabled (see enable_journal)
+journal: Optional[Journal] = None
+
+# Folds players who do not act in time, if enabled (see enable_turn_timer)
+turn_timer: Optional[TurnTimer] = None
+
+def new_table(table_id: str) -> Game:
+    """Create and register a table; call with registry_lock held"""
+    game = Game(table_id)
+    game.journal = journal
+    game.timer = turn_timer
+    if journal is not None:
+        journal.append({"t": table_id, "op": "create"})
+    tables[table_id] = game
+    return game
+
+def get_table(table_id: str) -> Game:
+    """Look up a table by id or fail with 404"""
+    game = tables.get(table_id)
+    if game is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+    return game
+
+def showdown(game: Game):
+    """Split the pot between the strongest active hands and end the game"""
+    winners, strength = game.showdown()
+    metrics.inc("joker_showdowns_total")
+    metrics.inc("joker_hands_total")
+    return ShowdownResult(winners[0].name, from_cents(winners[0].balance), describe(strength),
+                          [winner.name for winner in winners])
+
+def apply_bet(game: Game, player: Player, amount: float):
+    """Place a bet given in currency units (converted to cents for the ledger)"""
+    msg = game.bet(player, to_cents(amount))
+    if msg is not None:
+        raise HTTPException(status_code=400, detail=msg)
+    return BetResult("Bet placed", from_cents(game.pot))
+
+def apply_fold(game: Game, player: Player):
+    winner = game.fold(player)
+    if winner is not None:
+        metrics.inc("joker_hands_total")
+        return WinResult(winner.name, from_cents(winner.balance))
+    return FoldResult("Folded")
+
+@contextmanager
+def _traced_lock(game: Game):
+    with tracer.span("lock_wait"):
+        game.lock.acquire()
+    try:
+        yield
+    finally:
+        game.lock.release()
+
+def locked(game: Game):
+    """game.lock, with the wait for it traced when tracing is on"""
+    return _traced_lock(game) if tracer.enabled else game.lock
+
+def check_can_join(game: Game, name: str):
+    if game.is_active:
+        raise HTTPException(status_code=400, detail="Game already started")
+    if name in game.seats:
+        raise HTTPException(status_code=400, detail="Name already exists")
+
+# --- PERSISTENCE ---
+
+def enable_journal(directory: str, flush_interval: float = 0.002):
+    """Recover all tables from `directory` and journal every action from now on"""
+    global journal
+    with registry_lock:
+        recovered = recover(directory)
+        tables.clear()
+        tables.update(recovered)
+        journal = Journal(directory, flush_interval)
+        for game in tables.values():
+            game.journal = journal
+            game.timer = turn_timer
+        if DEFAULT_TABLE not in tables and owns_table(DEFAULT_TABLE):
+            new_table(DEFAULT_TABLE)
+    # Compact right away so the next restart replays only new actions
+    snapshot_tables()
+
+def snapshot_tables():
+    """
+    Snapshot every table and start a new journal segment. All table locks
+    are held briefly so the snapshot lines up exactly with the segment
+    boundary; the file itself is written after they are released.
+    """
+    if journal is None:
+        return
+    with registry_lock:
+        games = list(tables.values())
+        for game in games:
+            game.lock.acquire()
+        try:
+            replay_from = journal.rotate()
+            state = {game.table_id: snapshot_game(game) for game in games}
+        finally:
+            for game in games:
+                game.lock.release()
+    journal.write_snapshot(state, replay_from)
+
+def wait_durable():
+    """
+    Block until every action journaled so far, the caller's included, is
+    fsynced. Mutating handlers call this after releasing the table lock and
+    before responding, so an acknowledged action survives a crash. Fails
+    with 503 once the journal can no longer write.
+    """
+    current = journal
+    if current is not None:
+        try:
+            current.wait()
+        except JournalError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+def disable_journal():
+    """Take a final snapshot and close the journal"""
+    global journal
+    if journal is None:
+        return
+    try:
+        snapshot_tables()
+    except JournalError as e:
+        print(f"Final snapshot failed: {e!r}")
+    # Detach before closing: an action journaled after close() would never
+    # be flushed, and its handler would wait for it forever. Taking each
+    # table lock lets in-flight actions finish appending first.
+    with registry_lock:
+        current, journal = journal, None
+        games = list(tables.values())
+    for game in games:
+        with game.lock:
+            game.journal = None
+    try:
+        current.close()
+    except JournalError as e:
+        print(f"Closing the journal failed: {e!r}")
+
+# --- TURN TIMER ---
+
+def expire_turn(game: Game, token: int):
+    """Fold the current player if the turn scheduled with `token` is still running"""
+    with game.lock:
+        # A closed table may have been recreated under the same id; its
+        # deadlines must not touch (or journal against) the new one
+        if tables.get(game.table_id) is not game:
+            return
+        if game.is_active and game.turn_token == token:
+            apply_fold(game, game.current_player())
+
+def enable_turn_timer(timeout: float):
+    """Give every player `timeout` seconds per turn before they are folded"""
+    global turn_timer
+    timer = TurnTimer(timeout, expire_turn)
+    with registry_lock:
+        turn_timer = timer
+        games = list(tables.values())
+    for game in games:
+        with game.lock:
+            game.timer = timer
+            if game.is_active:
+                timer.schedule(game, game.turn_token)
+
+def disable_turn_timer():
+    global turn_timer
+    if turn_timer is None:
+        return
+    with registry_lock:
+        timer, turn_timer = turn_timer, None
+        for game in tables.values():
+            game.timer = None
+    timer.close()
+
+# --- TABLE MANAGEMENT ENDPOINTS ---
+
+@router.get("/tables")
+def list_tables():
+    """List the ids of all tables hosted by this process"""
+    return JSONResponse(TableList(list(tables)))
+
+@router.delete("/tables/{table_id}")
+def close_table(table_id: str):
+    """Remove a table from the registry"""
+    with registry_lock:
+        game = get_table(table_id)
+        del tables[table_id]
+        if journal is not None:
+            journal.append({"t": table_id, "op": "close"})
+    with game.lock:
+        # Nothing may act on or journal for the removed table any more
+        game.timer = game.journal = None
+    game.events.close()
+    wait_durable()
+    return {"message": "Table closed"}
 
 # --- GAME MANAGEMENT ENDPOINTS ---
 
 @router.post("/start_game")
-def start_game():
-    """Resets and initializes a new game session"""
-    global game
-    game = Game()
-    return {"message": "New game initialized"}
+@router.post("/tables/{table_id}/start_game")
+def start_game(table_id: str = DEFAULT_TABLE):
+    """Resets and initializes a new game session (creates the table if needed)"""
+    with registry_lock:
+        game = tables.get(table_id)
+        if game is None:
+            new_table(table_id)
+    
+    if game is not None:
+        with game.lock:
+            game.restart()
+    wait_durable()
+    return {"message": "New game initialized", "table_id": table_id}
 
 @router.post("/join_game")
-def join_game(request: JoinGameRequest):
+@router.post("/tables/{table_id}/join_game")
+async def join_game(request: JoinGameRequest, table_id: str = DEFAULT_TABLE):
     """Allows a player to join the game before it starts"""
-    if game.is_active:
-        raise HTTPException(status_code=400, detail="Game already started")
-    
-    if any(p.name == request.name for p in game.players):
-        raise HTTPException(status_code=400, detail="Name already exists")
+    game = get_table(table_id)
+    check_can_join(game, request.name)
     
     # Fetch cards from the dealer API
+    started = time.perf_counter()
+    outcome = "error"
     try:
-        response = requests.get(f"{request.host_url}/get_cards")
-        response.raise_for_status()  # Raise an error for bad responses (4xx, 5xx)
-        cards_data = response.json().get("cards", [])
+        cards_data = await get_dealer().get_cards(request.host_url)
+        outcome = "ok"
+    except CircuitOpenError as e:
+        outcome = "circuit_open"
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch cards: {str(e)}")
+    finally:
+        metrics.observe("joker_dealer_request_duration_seconds", time.perf_counter() - started,
+                        (("outcome", outcome),))
     
-    # Create a new player with the fetched cards
-    new_player = Player(name=request.name, cards=cards_data)
-    game.players.append(new_player)
-    
-    return {"status": "Joined", "players": [p.name for p in game.players]}
+    # Other requests may have run while we awaited the dealer. The critical
+    # section is short and never awaits, so holding the table lock on the
+    # event loop thread is fine.
+    game = get_table(table_id)
+    with locked(game):
+        with tracer.span("validate"):
+            check_can_join(game, request.name)
+        
+        # Create a new player with the fetched cards
+        with tracer.span("mutate"):
+            game.join(request.name, cards_data)
+        
+        players = [p.name for p in game.players]
+    if journal is not None:
+        await asyncio.to_thread(wait_durable)
+    return JSONResponse(JoinResult("Joined", players))
 
 @router.post("/start_and_play")
-def start_and_play():
+@router.post("/tables/{table_id}/start_and_play")
+def start_and_play(table_id: str = DEFAULT_TABLE):
     """Starts the game with current players (requires >=2 players)"""
-    if len(game.players) < 2:
-        raise HTTPException(status_code=400, detail="Need at least 2 players")
-    if game.is_active:
-        raise HTTPException(status_code=400, detail="Game already started")
+    game = get_table(table_id)
+    with locked(game):
+        with tracer.span("validate"):
+            if len(game.players) < 2:
+                raise HTTPException(status_code=400, detail="Need at least 2 players")
+            if game.is_active:
+                raise HTTPException(status_code=400, detail="Game already started")
+            if 2 * len(game.players) > len(STANDARD_DECK):
+                raise HTTPException(status_code=400, detail="Too many players to deal two cards each")
     
-    initialize_game(game)
-    return {"message": "Game started", "current_turn": game.current_turn_order[0]}
+        with tracer.span("mutate"):
+            initialize_game(game)
+        current_turn = game.current_player().name
+    wait_durable()
+    return JSONResponse(GameStarted("Game started", current_turn))
 
 # --- GAMEPLAY ENDPOINTS ---
 
 @router.post("/place_bet")
-def place_bet(bet: BetRequest):
+@router.post("/tables/{table_id}/place_bet")
+def place_bet(bet: BetRequest, table_id: str = DEFAULT_TABLE):
     """Place a bet during your turn"""
-    if not game.is_active:
-        raise HTTPException(status_code=400, detail="Game not active")
+    game = get_table(table_id)
+    with locked(game):
+        with tracer.span("validate"):
+            if not game.is_active:
+                raise HTTPException(status_code=400, detail="Game not active")
     
-    player = next((p for p in game.players if p.name == bet.name), None)
-    if not player or not player.is_active:
-        raise HTTPException(status_code=404, detail="Player not found or inactive")
+            player = game.get_player(bet.name)
+            if not player or not player.is_active:
+                raise HTTPException(status_code=404, detail="Player not found or inactive")
     
-    if game.current_turn_order[game.current_turn_index] != player.name:
-        raise HTTPException(status_code=400, detail="Not your turn")
+            if not game.is_turn(player):
+                raise HTTPException(status_code=400, detail="Not your turn")
     
-    success, msg = player.place_bet(bet.amount)
-    if not success:
-        raise HTTPException(status_code=400, detail=msg)
+        with tracer.span("mutate"):
+            result = apply_bet(game, player, bet.amount)
     
-    game.pot += bet.amount
-    game.current_turn_index = (game.current_turn_index + 1) % len(game.current_turn_order)
-    return {"status": "Bet placed", "current_pot": game.pot}
+    wait_durable()
+    with tracer.span("serialize"):
+        return JSONResponse(result)
 
 @router.post("/fold")
-def fold_player(fold: FoldRequest):
+@router.post("/tables/{table_id}/fold")
+def fold_player(fold: FoldRequest, table_id: str = DEFAULT_TABLE):
     """Fold your hand and exit current round"""
-    player = next((p for p in game.players if p.name == fold.name), None)
-    if not player or not player.is_active:
-        raise HTTPException(status_code=404, detail="Player not found or inactive")
+    game = get_table(table_id)
+    with locked(game):
+        with tracer.span("validate"):
+            if not game.is_active:
+                raise HTTPException(status_code=400, detail="Game not active")
     
-    player.fold()
-    active_players = [p for p in game.players if p.is_active]
+            player = game.get_player(fold.name)
+            if not player or not player.is_active:
+                raise HTTPException(status_code=404, detail="Player not found or inactive")
     
-    if len(active_players) == 1:
-        winner = active_players[0]
-        winner.balance += game.pot
-        game.pot = 0.0
-        game.is_active = False
-        return {"winner": winner.name, "balance": winner.balance}
+        with tracer.span("mutate"):
+            result = apply_fold(game, player)
     
-    game.current_turn_index = (game.current_turn_index + 1) % len(game.current_turn_order)
-    return {"status": "Folded"}
+    wait_durable()
+    with tracer.span("serialize"):
+        return JSONResponse(result)
 
 @router.post("/compare_cards")
-def compare_cards():
+@router.post("/tables/{table_id}/compare_cards")
+def compare_cards(table_id: str = DEFAULT_TABLE):
     """Determine winner by comparing player hands"""
-    if not game.is_active:
-        raise HTTPException(status_code=400, detail="Game not active")
+    game = get_table(table_id)
+    with locked(game):
+        with tracer.span("validate"):
+            if not game.is_active:
+                raise HTTPException(status_code=400, detail="Game not active")
     
-    active_players = [p for p in game.players if p.is_active]
-    if len(active_players) < 2:
-        raise HTTPException(status_code=400, detail="Not enough players to compare")
-    
-    # Simple comparison based on sum of card ranks
-    rank_map = {'2':2, '3':3, '4':4, '5':5, '6':6, '7':7, '8':8, '9':9, '10':10,
-                'J':11, 'Q':12, 'K':13, 'A':14}
+            if game.active_count < 2:
+                raise HTTPException(status_code=400, detail="Not enough players to compare")
     
-    best_score = -1
-    winner = None
-    for player in active_players:
-        score = sum(rank_map[card.rank] for card in player.cards)
-        if score > best_score:
-            best_score = score
-            winner = player
+        with tracer.span("mutate"):
+            result = showdown(game)
     
-    winner.balance += game.pot
-    game.pot = 0.0
-    game.is_active = False
-    return {"winner": winner.name, "balance": winner.balance}
+    wait_durable()
+    with tracer.span("serialize"):
+        return JSONResponse(result)
 
 # --- STATUS ENDPOINTS ---
 
-@router.get("/game_status", response_model=GameStatusResponse)
-def game_status():
-    """Get current game status"""
-    current_turn = game.current_turn_order[game.current_turn_index] if game.is_active else None
-    players_data = [
-        {
-            "name": p.name,
-            "balance": p.balance,
-            "current_bet": p.current_bet,
-            "is_active": p.is_active
-        } for p in game.players
-    ]
-    
-    return GameStatusResponse(
+def game_status_payload(game: Game) -> GameStatus:
+    """Current status; call with game.lock held"""
+    return GameStatus(
         is_active=game.is_active,
-        pot=game.pot,
-        current_turn=current_turn,
-        players=players_data
+        pot=from_cents(game.pot),
+        current_turn=game.current_player().name if game.is_active else None,
+        players=[
+            PlayerStatus(p.name, from_cents(p.balance), from_cents(p.current_bet), p.is_active)
+            for p in game.players
+        ],
     )
 
+def cached_status(game: Game):
+    """Return (etag, body) for the current state, serializing at most once per version"""
+    cache = game.status_cache
+    if cache is not None and cache[0] == game.version:
+        return cache[1], cache[2]
+    with locked(game):
+        version = game.version
+        etag = f'"{game.epoch}-{version}"'
+        with tracer.span("serialize"):
+            body = dumps(game_status_payload(game))
+        game.status_cache = (version, etag, body)
+    return etag, body
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+def status_delta(game: Game, since: int, epoch: Optional[str]) -> dict:
+    """
+    Events after version `since`, taken from the table's bounded event
+    history. Applied in order to the status at `since` they give the
+    current status. Falls back to a full snapshot when the history no
+    longer reaches back that far or the client's epoch or version is not
+    from this table.
+    """
+    if epoch in (None, game.epoch) and since <= game.version:
+        events = game.events.since(since)
+        if events is not None:
+            version = events[-1]["seq"] if events else since
+            return {"epoch": game.epoch, "version": version, "since": since, "events": events}
+    with game.lock:
+        return {"epoch": game.epoch, "version": game.version, "snapshot": game_status_payload(game)}
+
+@router.get("/game_status", response_model=GameStatusResponse)
+@router.get("/tables/{table_id}/game_status", response_model=GameStatusResponse)
+def game_status(table_id: str = DEFAULT_TABLE, since: Optional[int] = Query(None, ge=0),
+                epoch: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
+    """
+    Get current game status (supports ETag / If-None-Match). With
+    ?since=<version>[&epoch=<epoch>], return only the changes since then.
+    """
+    game = get_table(table_id)
+    if since is not None:
+        return JSONResponse(status_delta(game, since, epoch))
+    
+    etag, body = cached_status(game)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 @router.get("/show_pot")
-def show_pot():
+@router.get("/tables/{table_id}/show_pot")
+def show_pot(table_id: str = DEFAULT_TABLE):
     """Show current pot amount"""
-    return {"pot": game.pot}
+    game = get_table(table_id)
+    return JSONResponse(PotStatus(from_cents(game.pot)))
 
 @router.get("/show_cards")
-def show_cards(name: str = Query(...)):
+@router.get("/tables/{table_id}/show_cards")
+def show_cards(name: str = Query(...), table_id: str = DEFAULT_TABLE):
     """Show cards for specific player"""
-    player = next((p for p in game.players if p.name == name), None)
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
+    game = get_table(table_id)
+    with game.lock:
+        player = game.get_player(name)
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
     
-    return {
-        "player": name,
-        "cards": [f"{card.rank} of {card.suit}" for card in player.cards]
-    }
+        return JSONResponse(PlayerCards(name, [card_name(card) for card in player.cards]))
+
+# --- PUSH NOTIFICATIONS ---
+
+@router.get("/events")
+@router.get("/tables/{table_id}/events")
+async def table_events(table_id: str = DEFAULT_TABLE, since: Optional[int] = None,
+                       last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of table events (join, start, turn, bet,
+    fold, winner, reset). Resume with ?since=<seq> or the Last-Event-ID header.
+    """
+    game = get_table(table_id)
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    async def stream():
+        async for event in game.events.subscribe(since):
+            yield format_sse(event)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@router.websocket("/ws")
+@router.websocket("/tables/{table_id}/ws")
+async def table_websocket(websocket: WebSocket, table_id: str = DEFAULT_TABLE, since: Optional[int] = None):
+    """WebSocket stream of the same events as /events, one JSON message each"""
+    game = tables.get(table_id)
+    if game is None:
+        await websocket.close(code=4404)
+        return
+    
+    await websocket.accept()
+    
+    async def send_events():
+        async for event in game.events.subscribe(since):
+            await websocket.send_json(event)
+        await websocket.close()
+    
+    async def wait_disconnect():
+        # Clients never need to send anything, but reading is the only way
+        # to notice a disconnect on a table with no events to send
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    sender = asyncio.ensure_future(send_events())
+    receiver = asyncio.ensure_future(wait_disconnect())
+    try:
+        await asyncio.wait((sender, receiver), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Cancelling the sender ends the subscription
+        for task in (sender, receiver):
+            task.cancel()
+        results = await asyncio.gather(sender, receiver, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception) and not isinstance(result, WebSocketDisconnect):
+            raise result
+
+@router.get("/equity")
+@router.get("/tables/{table_id}/equity")
+def player_equity(name: str = Query(...), opponents: int = Query(1, ge=1, le=25),
+                  samples: int = Query(DEFAULT_SAMPLES, ge=100, le=MAX_SAMPLES),
+                  table_id: str = DEFAULT_TABLE):
+    """Win probability of a player's cards against N random opponent hands"""
+    game = get_table(table_id)
+    with game.lock:
+        player = game.get_player(name)
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        cards = list(player.cards)
+    
+    # Computed outside the table lock: it can take a while on a cache miss
+    try:
+        result = equity(cards, opponents, samples)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(EquityResult(name, [card_name(card) for card in cards], opponents, **result))
 
 # --- UTILITIES ---
 
@@ -172,7 +554,8 @@ def ping():
 # --- NEW ENDPOINT FOR HANDLING PLAYER ACTIONS ---
 
 @router.post("/isurturn")
-def handle_player_action(request: dict):
+@router.post("/tables/{table_id}/isurturn")
+def handle_player_action(request: dict, table_id: str = DEFAULT_TABLE):
     """
     Handle player actions like bet, fold, or show.
     Expected JSON payload:
@@ -181,97 +564,45 @@ def handle_player_action(request: dict):
         "amount": 50      # Required only for "bet"
     }
     """
-    # Ensure the game is active
-    if not game.is_active:
-        raise HTTPException(status_code=400, detail="Game not active")
-    
-    # Get the current player's name
-    current_player_name = game.current_turn_order[game.current_turn_index]
+    game = get_table(table_id)
+    with locked(game):
+        # Ensure the game is active
+        if not game.is_active:
+            raise HTTPException(status_code=400, detail="Game not active")
     
-    try:
-        action = request.get("action")
-        if action == "bet":
-            amount = request.get("amount", 0)
-            if amount <= 0:
-                raise HTTPException(status_code=400, detail="Invalid bet amount")
-            
-            # Call the place_bet logic directly
-            player = next((p for p in game.players if p.name == current_player_name), None)
-            if not player or not player.is_active:
-                raise HTTPException(status_code=404, detail="Player not found or inactive")
+        try:
+            action = request.get("action")
+            if action == "bet":
+                amount = request.get("amount", 0)
+                if amount <= 0:
+                    raise HTTPException(status_code=400, detail="Invalid bet amount")
             
-            success, msg = player.place_bet(amount)
-            if not success:
-                raise HTTPException(status_code=400, detail=msg)
+                # Call the place_bet logic directly
+                player = game.current_player()
+                if not player or not player.is_active:
+                    raise HTTPException(status_code=404, detail="Player not found or inactive")
             
-            game.pot += amount
-            game.current_turn_index = (game.current_turn_index + 1) % len(game.current_turn_order)
-            return {"status": "Bet placed", "current_pot": game.pot}
+                response = JSONResponse(apply_bet(game, player, amount))
         
-        elif action == "fold":
-            # Call the fold logic directly
-            player = next((p for p in game.players if p.name == current_player_name), None)
-            if not player or not player.is_active:
-                raise HTTPException(status_code=404, detail="Player not found or inactive")
-            
-            player.fold()
-            active_players = [p for p in game.players if p.is_active]
-            
-            if len(active_players) == 1:
-                winner = active_players[0]
-                winner.balance += game.pot
-                game.pot = 0.0
-                game.is_active = False
-                return {"winner": winner.name, "balance": winner.balance}
+            elif action == "fold":
+                # Call the fold logic directly
+                player = game.current_player()
+                if not player or not player.is_active:
+                    raise HTTPException(status_code=404, detail="Player not found or inactive")
             
-            game.current_turn_index = (game.current_turn_index + 1) % len(game.current_turn_order)
-            return {"status": "Folded"}
+                response = JSONResponse(apply_fold(game, player))
         
-        elif action == "show":
-            active_players = [p for p in game.players if p.is_active]
-            if len(active_players) < 2:
-                raise HTTPException(status_code=400, detail="Not enough players to compare")
-            
-            # Compare cards logic
-            rank_map = {'2':2, '3':3, '4':4, '5':5, '6':6, '7':7, '8':8, '9':9, '10':10,
-                        'J':11, 'Q':12, 'K':13, 'A':14}
-            
-            best_score = -1
-            winner = None
-            for player in active_players:
-                score = sum(rank_map[card.rank] for card in player.cards)
-                if score > best_score:
-                    best_score = score
-                    winner = player
+            elif action == "show":
+                if game.active_count < 2:
+                    raise HTTPException(status_code=400, detail="Not enough players to compare")
             
-            winner.balance += game.pot
-            game.pot = 0.0
-            game.is_active = False
-            return {"winner": winner.name, "balance": winner.balance}
+                response = JSONResponse(showdown(game))
         
-        else:
-            raise HTTPException(status_code=400, detail="Invalid action")
+            else:
+                raise HTTPException(status_code=400, detail="Invalid action")
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error handling action: {str(e)}")
-
-# --- AUTOMATIC JOIN ON STARTUP ---
-
-# Automatically join two players when the server starts
-def auto_join_players():
-    players_to_join = [
-        {"name": "JK", "host_url": "http://127.0.0.1:8000"},
-        {"name": "Alice", "host_url": "http://127.0.0.1:8000"}
-    ]
-    for player in players_to_join:
-        try:
-            response = requests.post(
-                "http://127.0.0.1:8000/join_game",
-                json=player
-            )
-            print(f"Joined player: {player['name']}, Response: {response.json()}")
         except Exception as e:
-            print(f"Failed to join player {player['name']}: {str(e)}")
-
-# Call the auto_join_players function when the server starts
-auto_join_players()
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Error handling action: {str(e)}")
+    
+    wait_durable()
+    return response
@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import List
+
+# On-demand profiling of a live process. sample_stacks() is a sampling
+# profiler: it reads every thread's current frame at a fixed interval and
+# counts the distinct stacks, so the profiled code runs unmodified and the
+# overhead is paid by the sampling thread alone. The output is the
+# collapsed-stack format read by flamegraph.pl and speedscope.
+
+# One profile at a time per process
+profile_lock = threading.Lock()
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Counter:
+    """Sample all other threads for `seconds`; returns {collapsed stack: samples}"""
+    me = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, str(ident)))
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+def collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+def top_allocations(seconds: float = 10.0, limit: int = 25, frames: int = 1) -> dict:
+    """
+    Largest live allocations by source line. If tracemalloc is not already
+    running it is started, left on for `seconds` and stopped again, so only
+    allocations made in that window are seen.
+    """
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+        time.sleep(seconds)
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    key_type = "traceback" if frames > 1 else "lineno"
+    allocations: List[dict] = []
+    for stat in snapshot.statistics(key_type)[:limit]:
+        allocations.append({
+            "size": stat.size,
+            "count": stat.count,
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        })
+    return {"traced_bytes": traced, "peak_bytes": peak, "window": seconds if started_here else None,
+            "allocations": allocations}
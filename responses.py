@@ -0,0 +1,104 @@
+import dataclasses
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi.responses import Response
+
+# Response encoding for the game API. Handlers build the structs below and
+# return them wrapped in JSONResponse, which encodes straight to bytes with
+# orjson (if installed) and skips FastAPI's generic jsonable_encoder pass.
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+def _default(obj):
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj) -> bytes:
+    """Encode plain data and the response structs to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode()
+
+class JSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+# --- RESPONSE STRUCTS ---
+
+@dataclass
+class PlayerStatus:
+    name: str
+    balance: float
+    current_bet: float
+    is_active: bool
+
+@dataclass
+class GameStatus:
+    is_active: bool
+    pot: float
+    current_turn: Optional[str]
+    players: List[PlayerStatus]
+
+@dataclass
+class BetResult:
+    status: str
+    current_pot: float
+
+@dataclass
+class FoldResult:
+    status: str
+
+@dataclass
+class WinResult:
+    """The last player standing after a fold"""
+    winner: str
+    balance: float
+
+@dataclass
+class ShowdownResult:
+    winner: str          # First of the winners
+    balance: float
+    hand: str
+    winners: List[str]   # Everyone sharing the pot, in seat order
+
+@dataclass
+class PlayerCards:
+    player: str
+    cards: List[str]
+
+@dataclass
+class TableList:
+    tables: List[str]
+
+@dataclass
+class JoinResult:
+    status: str
+    players: List[str]
+
+@dataclass
+class GameStarted:
+    message: str
+    current_turn: str
+
+@dataclass
+class PotStatus:
+    pot: float
+
+@dataclass
+class EquityResult:
+    player: str
+    cards: List[str]
+    opponents: int
+    win: float
+    tie: float
+    equity: float
+    samples: int
+    exact: bool
@@ -0,0 +1,58 @@
+import bisect
+import hashlib
+import os
+from typing import List, Optional
+
+def _hash(key: str) -> int:
+    # Stable across processes (unlike hash(), which is salted per process)
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    """
+    Consistent-hash ring mapping table ids to worker nodes. Each node is
+    placed at `vnodes` points on the ring, so load spreads evenly and
+    adding or removing a node only moves about 1/N of the tables.
+    """
+
+    def __init__(self, nodes: List[str], vnodes: int = 160):
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        self.nodes = list(nodes)
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[i]
+
+class Placement:
+    """This worker's view of the cluster: its own URL and the ring of all workers"""
+
+    def __init__(self, workers: List[str], self_url: str, vnodes: int = 160):
+        if self_url not in workers:
+            raise ValueError(f"{self_url} is not one of the workers")
+        self.workers = workers
+        self.self_url = self_url
+        self.ring = HashRing(workers, vnodes)
+
+    def owner(self, table_id: str) -> str:
+        return self.ring.owner(table_id)
+
+    def is_local(self, table_id: str) -> bool:
+        return self.ring.owner(table_id) == self.self_url
+
+def placement_from_env() -> Optional[Placement]:
+    """
+    Build the placement from JOKER_WORKERS (comma separated base URLs of
+    every worker, identical on all workers) and JOKER_WORKER_ID (this
+    worker's index in that list). Returns None for a single-process
+    deployment.
+    """
+    workers = [w.strip().rstrip("/") for w in os.environ.get("JOKER_WORKERS", "").split(",") if w.strip()]
+    if len(workers) < 2:
+        return None
+    worker_id = int(os.environ.get("JOKER_WORKER_ID", "0"))
+    return Placement(workers, workers[worker_id])
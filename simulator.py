@@ -0,0 +1,151 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+from decks import DeckPool
+from models import Game, Player, DEFAULT_BALANCE
+
+# Headless engine: plays hands through the same Game rules the HTTP API
+# uses (join, start, bet, fold, showdown), with no server in between. Used
+# for bot evaluation, balance tuning and load modelling.
+
+# A strategy decides one action for the player whose turn it is:
+# ("bet", cents) or ("fold", 0).
+Strategy = Callable[[Game, Player, random.Random], tuple]
+
+class RandomStrategy:
+    """Folds with `fold_probability`, otherwise bets `bet_size` cents (picklable)"""
+
+    def __init__(self, fold_probability: float = 0.2, bet_size: int = 100):
+        self.fold_probability = fold_probability
+        self.bet_size = bet_size
+
+    def __call__(self, game: Game, player: Player, rng: random.Random) -> tuple:
+        if rng.random() < self.fold_probability:
+            return "fold", 0
+        return "bet", self.bet_size
+
+class Simulator:
+    """
+    Plays hands between a fixed set of players. Each hand is one Game: the
+    players join with their current stacks, the deck is dealt, every
+    player acts for `orbits` turns around the table, then the remaining
+    hands go to showdown. A bet the player cannot cover counts as a fold,
+    and a player whose stack can no longer cover their strategy's
+    `bet_size` (or who is broke, for strategies without one) rebuys to the
+    starting balance.
+    """
+
+    def __init__(self, players: int = 2, strategies: Optional[Sequence[Strategy]] = None,
+                 balance: int = DEFAULT_BALANCE, orbits: int = 1, seed: Optional[int] = None):
+        self.names = [f"p{i}" for i in range(players)]
+        self.strategies = list(strategies) if strategies else [RandomStrategy()] * players
+        if len(self.strategies) != players:
+            raise ValueError("Need one strategy per player")
+        self.orbits = orbits
+        # Below this a player would fold every hand, so they rebuy instead
+        self.min_bets = [getattr(strategy, "bet_size", 1) for strategy in self.strategies]
+        self.rng = random.Random(seed)
+        self.decks = DeckPool(seed=self.rng.getrandbits(64))
+        self.balance = balance
+        self.stacks = {name: balance for name in self.names}
+        self.stats = new_stats(self.names)
+
+    def play_hand(self) -> List[str]:
+        """Play one hand and return the winners' names (several on a split pot)"""
+        stats = self.stats
+        game = Game()
+        for name in self.names:
+            game.join(name, [], self.stacks[name])
+        game.start(self.decks.get())
+
+        for _ in range(self.orbits * len(self.names)):
+            player = game.current_player()
+            action, amount = self.strategies[player.seat](game, player, self.rng)
+            stats["actions"] += 1
+            if action == "bet" and game.bet(player, amount) is None:
+                continue
+            winner = game.fold(player)
+            if winner is not None:
+                winners = [winner]
+                break
+        else:
+            winners, _ = game.showdown()
+            stats["showdowns"] += 1
+
+        for player in game.players:
+            stats["net"][player.name] += player.balance - self.stacks[player.name]
+            self.stacks[player.name] = player.balance
+            if player.balance < self.min_bets[player.seat]:
+                self.stacks[player.name] = self.balance
+                stats["rebuys"] += 1
+        for winner in winners:
+            stats["wins"][winner.name] += 1
+        stats["hands"] += 1
+        return [winner.name for winner in winners]
+
+    def run(self, hands: int) -> dict:
+        for _ in range(hands):
+            self.play_hand()
+        return self.stats
+
+def new_stats(names: Sequence[str]) -> dict:
+    return {
+        "hands": 0,
+        "showdowns": 0,
+        "actions": 0,
+        "rebuys": 0,
+        "wins": {name: 0 for name in names},
+        "net": {name: 0 for name in names},  # Cents won or lost
+    }
+
+def merge_stats(results: List[dict]) -> dict:
+    merged = new_stats(results[0]["wins"]) if results else new_stats([])
+    for result in results:
+        for key in ("hands", "showdowns", "actions", "rebuys"):
+            merged[key] += result[key]
+        for key in ("wins", "net"):
+            for name, value in result[key].items():
+                merged[key][name] += value
+    return merged
+
+def _run_chunk(hands: int, seed: int, kwargs: dict) -> dict:
+    return Simulator(seed=seed, **kwargs).run(hands)
+
+def run_parallel(hands: int, processes: Optional[int] = None, seed: int = 0, **kwargs) -> dict:
+    """
+    Split `hands` across a process pool, each worker running its own
+    Simulator with a distinct seed, and merge the stats. Results are
+    reproducible for a given (hands, processes, seed).
+    """
+    processes = processes or os.cpu_count() or 1
+    chunks = [hands // processes + (1 if i < hands % processes else 0) for i in range(processes)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(_run_chunk, chunk, seed * 1_000_003 + i, kwargs)
+            for i, chunk in enumerate(chunks) if chunk
+        ]
+        return merge_stats([future.result() for future in futures])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless game simulations")
+    parser.add_argument("--hands", type=int, default=100_000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--orbits", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = run_parallel(args.hands, args.processes, args.seed, players=args.players, orbits=args.orbits)
+    elapsed = time.perf_counter() - started
+    print(f"{stats['hands']} hands in {elapsed:.2f}s ({stats['hands'] / elapsed * 60:,.0f} hands/min)")
+    print(f"showdowns: {stats['showdowns']}  actions: {stats['actions']}  rebuys: {stats['rebuys']}")
+    for name in stats["wins"]:
+        print(f"  {name}: wins {stats['wins'][name]}, net {stats['net'][name] / 100:+.2f}")
+
+if __name__ == "__main__":
+    main()
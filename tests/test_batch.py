@@ -0,0 +1,17 @@
+import random
+
+import numpy as np
+import pytest
+
+from batch import evaluate_batch
+from evaluator import evaluate
+from test_evaluator import random_hands
+
+@pytest.mark.parametrize("k", range(1, 8))
+def test_batch_matches_scalar(k):
+    # random_hands mixes in one- and two-suit decks, so many rows are flushes
+    hands = np.array(random_hands(random.Random(100 + k), k, 3_000))
+    expected = [evaluate(hand.tolist()) for hand in hands]
+    assert evaluate_batch(hands).tolist() == expected
+    # Chunking of 6- and 7-card hands must not change anything
+    assert evaluate_batch(hands, chunk_size=7).tolist() == expected
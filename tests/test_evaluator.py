@@ -0,0 +1,78 @@
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from evaluator import category, evaluate
+
+# Brute-force reference, written straight from the hand ranking rules:
+# (category, tie-break ranks), compared as tuples.
+
+def reference5(cards):
+    ranks = sorted((card >> 2 for card in cards), reverse=True)
+    groups = sorted(Counter(ranks).items(), key=lambda item: (item[1], item[0]), reverse=True)
+    shape = [count for _, count in groups]
+    ordered = [rank for rank, _ in groups]
+    flush = len({card & 3 for card in cards}) == 1
+    straight = None
+    if shape == [1] * 5:
+        if ranks[0] - ranks[4] == 4:
+            straight = ranks[0]
+        elif ranks == [12, 3, 2, 1, 0]:  # The wheel is five high
+            straight = 3
+    if straight is not None and flush:
+        return 8, [straight]
+    if shape == [4, 1]:
+        return 7, ordered
+    if shape == [3, 2]:
+        return 6, ordered
+    if flush:
+        return 5, ranks
+    if straight is not None:
+        return 4, [straight]
+    if shape == [3, 1, 1]:
+        return 3, ordered
+    if shape == [2, 2, 1]:
+        return 2, ordered
+    if shape == [2, 1, 1, 1]:
+        return 1, ordered
+    return 0, ranks
+
+def reference(cards):
+    return max(reference5(hand) for hand in combinations(cards, 5))
+
+def random_hands(rng, k, count):
+    """Hands from the full deck, plus decks narrowed to one suit or a few ranks so
+    that flushes, straight flushes, quads and full houses come up often"""
+    hands = []
+    for i in range(count):
+        if i % 3 == 0:
+            deck = range(52)
+        elif i % 3 == 1:
+            suits = rng.sample(range(4), 1 if k <= 13 and i % 2 else 2)
+            deck = [card for card in range(52) if card & 3 in suits]
+        else:
+            ranks = rng.sample(range(13), max(2, (k + 3) // 4 + 1))
+            deck = [card for card in range(52) if card >> 2 in ranks]
+        hands.append(rng.sample(list(deck), k))
+    return hands
+
+@pytest.mark.parametrize("k, count", [(5, 20_000), (7, 3_000)])
+def test_evaluate_matches_reference(k, count):
+    hands = random_hands(random.Random(k), k, count)
+    strengths = {}
+    for hand in hands:
+        expected = reference(hand)
+        strength = evaluate(hand)
+        assert category(strength) == expected[0], hand
+        strengths.setdefault((expected[0], tuple(expected[1])), set()).add(strength)
+
+    # Every reference rank maps to exactly one strength, and strengths
+    # order hands exactly as the reference does
+    keys = sorted(strengths)
+    assert all(len(strengths[key]) == 1 for key in keys)
+    ordered = [strengths[key].pop() for key in keys]
+    assert ordered == sorted(ordered)
+    assert len(set(ordered)) == len(ordered)
+    assert {key[0] for key in keys} == set(range(9))
@@ -0,0 +1,34 @@
+from models import Game
+from cards import STANDARD_DECK
+
+def test_next_hand_deals_folded_players_back_in():
+    game = Game("t1")
+    a = game.join("a", [], 1000)
+    b = game.join("b", [], 1000)
+    game.start(list(STANDARD_DECK))
+    assert game.bet(a, 100) is None
+    assert game.bet(b, 100) is None
+    assert game.fold(a) is b
+
+    game.start(list(STANDARD_DECK))
+    assert game.is_active
+    assert game.active_count == 2
+    assert [p.current_bet for p in game.players] == [0, 0]
+    assert game.current_player() is a
+    assert game.bet(a, 100) is None
+    assert game.current_player() is b
+
+def test_split_pot_publishes_every_winner_balance():
+    game = Game("t1")
+    a = game.join("a", [], 1000)
+    b = game.join("b", [], 1000)
+    game.start(list(STANDARD_DECK))
+    assert game.bet(a, 101) is None
+    # Same ranks, different suits: a tie
+    a.cards, b.cards = [0, 4], [1, 5]
+    winners, _ = game.showdown()
+    assert winners == [a, b]
+    assert (a.balance, b.balance) == (950, 1050)
+    event = game.events.history[-1]
+    assert event["type"] == "winner"
+    assert event["balances"] == {"a": 9.5, "b": 10.5}
@@ -0,0 +1,118 @@
+import contextlib
+import errno
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import dealer
+import playapi
+from decks import DeckPool, set_pool
+import journal as journal_module
+from journal import Journal, JournalError, recover, snapshot_game
+
+def state(tables):
+    return {table_id: snapshot_game(game) for table_id, game in tables.items()}
+
+@pytest.fixture
+def client(tmp_path):
+    dealer.set_dealer(dealer.DealerClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"cards": []}))))
+    set_pool(DeckPool(seed=7))
+    app = FastAPI()
+    app.include_router(playapi.router)
+    playapi.enable_journal(str(tmp_path))
+    with TestClient(app) as client:
+        yield client
+    # Tear down without the final snapshot, as after a crash
+    with contextlib.suppress(JournalError):
+        playapi.journal.close()
+    playapi.journal = None
+    playapi.tables.clear()
+    playapi.tables[playapi.DEFAULT_TABLE] = playapi.Game(playapi.DEFAULT_TABLE)
+    set_pool(None)
+    dealer.set_dealer(None)
+
+def join(client, table, *names):
+    for name in names:
+        assert client.post(f"{table}/join_game", json={"name": name, "host_url": "http://dealer"}).status_code == 200
+
+def test_crash_mid_hand_recovers_acknowledged_actions(client, tmp_path):
+    table = "/tables/t1"
+    client.post(f"{table}/start_game")
+    join(client, table, "a", "b", "c")
+    assert client.post(f"{table}/start_and_play").status_code == 200
+    assert client.post(f"{table}/place_bet", json={"name": "a", "amount": 10}).status_code == 200
+    # Snapshot in the middle of the hand, then keep playing into the next segment
+    playapi.snapshot_tables()
+    assert client.post(f"{table}/fold", json={"name": "b"}).status_code == 200
+    assert client.post(f"{table}/place_bet", json={"name": "c", "amount": 5}).status_code == 200
+
+    # Acknowledged actions are on disk without any explicit flush
+    assert state(recover(str(tmp_path))) == state(playapi.tables)
+
+def test_rejected_actions_do_not_break_recovery(client, tmp_path):
+    table = "/tables/t1"
+    client.post(f"{table}/start_game")
+    join(client, table, "a", "b", "c")
+    # Folding before the hand starts is rejected and leaves no record
+    assert client.post(f"{table}/fold", json={"name": "a"}).status_code == 400
+    assert client.post(f"{table}/start_and_play").status_code == 200
+
+    assert state(recover(str(tmp_path))) == state(playapi.tables)
+
+def test_replay_skips_a_failing_record(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.append({"t": "t1", "op": "create"})
+    journal.append({"t": "t1", "op": "join", "name": "a", "cards": [], "balance": 100})
+    journal.append({"t": "t1", "op": "fold", "name": "a"})  # Fails: no hand in progress
+    journal.append({"t": "t1", "op": "join", "name": "b", "cards": [], "balance": 100})
+    journal.close()
+
+    tables = recover(str(tmp_path))
+    assert [p.name for p in tables["t1"].players] == ["a", "b"]
+    assert tables["t1"].players[0].is_active
+
+def fail_fsync_once(monkeypatch):
+    real_fsync = journal_module.os.fsync
+    def fsync(fd):
+        monkeypatch.setattr(journal_module.os, "fsync", real_fsync)
+        raise OSError(errno.ENOSPC, "No space left on device")
+    monkeypatch.setattr(journal_module.os, "fsync", fsync)
+
+def test_write_failure_fails_waiters_instead_of_hanging(tmp_path, monkeypatch):
+    journal = Journal(str(tmp_path))
+    fail_fsync_once(monkeypatch)
+    ticket = journal.append({"t": "t1", "op": "create"})
+    with pytest.raises(JournalError):
+        journal.wait(ticket, timeout=5)
+    # The failure is permanent, even though fsync works again
+    with pytest.raises(JournalError):
+        journal.wait(journal.append({"t": "t2", "op": "create"}), timeout=5)
+    with pytest.raises(JournalError):
+        journal.close()
+
+def test_write_failure_is_a_503(client, monkeypatch):
+    client.post("/tables/t1/start_game")
+    fail_fsync_once(monkeypatch)
+    response = client.post("/tables/t1/join_game", json={"name": "a", "host_url": "http://dealer"})
+    assert response.status_code == 503
+
+def test_closed_table_deadline_does_not_touch_its_successor(client, tmp_path):
+    table = "/tables/t1"
+    client.post(f"{table}/start_game")
+    join(client, table, "a", "b")
+    assert client.post(f"{table}/start_and_play").status_code == 200
+    closed = playapi.tables["t1"]
+    assert client.delete(table).status_code == 200
+
+    client.post(f"{table}/start_game")
+    join(client, table, "a", "b")
+    assert client.post(f"{table}/start_and_play").status_code == 200
+    # The closed table's deadline for the same turn fires late
+    playapi.expire_turn(closed, closed.turn_token)
+    playapi.journal.wait()
+
+    assert playapi.tables["t1"].is_active
+    assert state(recover(str(tmp_path))) == state(playapi.tables)
@@ -0,0 +1,62 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Hashable
+
+# Turn deadlines for every table in the process, kept in one heap and served
+# by one thread, so idle tables cost a heap entry rather than a thread or a
+# sleeping task each.
+#
+# Entries are never removed early. Each carries the turn token it was
+# scheduled for; when a turn ends before its deadline the token no longer
+# matches and the expiry callback ignores it.
+
+class TurnTimer:
+    def __init__(self, timeout: float, on_expire: Callable[[Hashable, int], None]):
+        self.timeout = timeout
+        self.on_expire = on_expire
+        self._heap = []                 # (deadline, tiebreak, key, token)
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="turn-timer", daemon=True)
+        self._thread.start()
+
+    def schedule(self, key: Hashable, token: int):
+        """Call on_expire(key, token) once `timeout` seconds have passed"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            entry = (deadline, next(self._counter), key, token)
+            heapq.heappush(self._heap, entry)
+            # Only wake the thread if this is now the earliest deadline
+            if self._heap[0] is entry:
+                self._cond.notify()
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._heap:
+                        delay = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+                _, _, key, token = heapq.heappop(self._heap)
+            try:
+                self.on_expire(key, token)
+            except Exception as e:
+                print(f"Turn timer callback failed: {e}")
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
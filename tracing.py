@@ -0,0 +1,116 @@
+import json
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+# Lightweight spans for attributing request latency (validation, lock wait,
+# dealer I/O, JSON encoding). Finished spans go into a bounded ring buffer
+# and can be exported as OpenTelemetry (OTLP/JSON) trace data. The current
+# span lives in a context variable, so nesting follows asyncio tasks and
+# the threadpool that runs sync handlers.
+#
+# Tracing is off unless enabled (JOKER_TRACE_FILE, see main.py); a
+# disabled tracer hands out one shared no-op context manager.
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_NOOP = nullcontext()
+_current: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, kind: int, parent: Optional["Span"], attributes: dict):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = attributes
+        self.error = None
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+class Tracer:
+    def __init__(self, capacity: int = 10_000, enabled: bool = False):
+        self.spans = deque(maxlen=capacity)  # Finished spans, oldest dropped first
+        self.enabled = enabled
+
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+        """Context manager timing the enclosed block as a child of the current span"""
+        if not self.enabled:
+            return _NOOP
+        return self._span(name, kind, attributes)
+
+    @contextmanager
+    def _span(self, name: str, kind: int, attributes: dict):
+        span = Span(name, kind, _current.get(), attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.time_ns()
+            _current.reset(token)
+            self.spans.append(span)
+
+    def export(self, path: str, service: str = "joker") -> int:
+        """Write the buffered spans to `path` as OTLP/JSON; returns the span count"""
+        spans = list(self.spans)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(to_otlp(spans, service), f)
+        os.replace(tmp, path)
+        return len(spans)
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+def to_otlp(spans: Iterable[Span], service: str = "joker") -> dict:
+    """OTLP/JSON ExportTraceServiceRequest holding `spans`"""
+    encoded = []
+    for span in spans:
+        item = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start),
+            "endTimeUnixNano": str(span.end),
+            "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": span.error} if span.error else {"code": STATUS_OK},
+        }
+        if span.parent_id is not None:
+            item["parentSpanId"] = span.parent_id
+        encoded.append(item)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service)]},
+            "scopeSpans": [{"scope": {"name": "joker"}, "spans": encoded}],
+        }]
+    }
+
+# Process-wide tracer used by the API and the dealer client
+tracer = Tracer()